@@ -0,0 +1,9 @@
+# Name: Eugene Song
+# OSU Email: songeu@oregonstate.edu
+# Course: CS261 - Data Structures
+# Description: Benchmark suite comparing the HashMap engines across realistic workloads.
+#                   Run from the repository root with: python -m benchmarks --help
+
+from benchmarks.runner import (ENGINES, HASH_FUNCTIONS,
+                               run_benchmark, run_suite, compare)
+from benchmarks.workloads import WORKLOADS
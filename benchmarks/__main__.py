@@ -0,0 +1,78 @@
+# Name: Eugene Song
+# OSU Email: songeu@oregonstate.edu
+# Course: CS261 - Data Structures
+# Description: Command line for the benchmark suite.
+#                   python -m benchmarks run [--output results.json] [--baseline saved.json]
+#                   python -m benchmarks compare saved.json results.json
+
+import argparse
+import json
+import os
+import sys
+
+from benchmarks.runner import ENGINES, HASH_FUNCTIONS, run_suite, compare
+from benchmarks.workloads import WORKLOADS
+
+
+def _report(regressions: list) -> int:
+    """
+    -Prints regressions to stderr and returns the process exit code.
+    """
+    for message in regressions:
+        print('REGRESSION ' + message, file=sys.stderr)
+    return 1 if regressions else 0
+
+
+def main(argv: list = None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m benchmarks', description='Benchmark suite for the HashMap engines.')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run = commands.add_parser('run', help='run the suite and print JSON results')
+    run.add_argument('--engines', nargs='+', choices=sorted(ENGINES), default=['sc', 'oa'])
+    run.add_argument('--hashes', nargs='+', choices=sorted(HASH_FUNCTIONS), default=sorted(HASH_FUNCTIONS))
+    run.add_argument('--workloads', nargs='+', choices=sorted(WORKLOADS), default=sorted(WORKLOADS))
+    run.add_argument('--ops', type=int, default=5000)
+    run.add_argument('--seed', type=int, default=0)
+    run.add_argument('--capacity', type=int, default=64)
+    run.add_argument('--output', help='write JSON here instead of stdout')
+    run.add_argument('--baseline', help='saved JSON to compare this run against')
+    run.add_argument('--threshold', type=float, default=0.10)
+
+    check = commands.add_parser('compare', help='compare two saved JSON results')
+    check.add_argument('baseline')
+    check.add_argument('current')
+    check.add_argument('--threshold', type=float, default=0.10)
+
+    args = parser.parse_args(argv)
+
+    if args.command == 'compare':
+        with open(args.baseline) as baseline, open(args.current) as current:
+            return _report(compare(json.load(baseline), json.load(current), args.threshold))
+
+    results = run_suite(args.engines, args.hashes, args.workloads, args.ops, args.seed, args.capacity)
+    if args.output:
+        with open(args.output, 'w') as output:
+            json.dump(results, output, indent=2)
+    else:
+        json.dump(results, sys.stdout, indent=2)
+        print()
+
+    if args.baseline:
+        with open(args.baseline) as baseline:
+            return _report(compare(json.load(baseline), results, args.threshold))
+    return 0
+
+
+def _pin_hash_seed() -> None:
+    """
+    -Restarts the interpreter with PYTHONHASHSEED=0 if it is not set, so the hash_builtin and hash_int_mix
+    results of two runs are comparable.
+    """
+    if os.environ.get('PYTHONHASHSEED') is None:
+        os.environ['PYTHONHASHSEED'] = '0'
+        os.execv(sys.executable, [sys.executable, '-m', 'benchmarks'] + sys.argv[1:])
+
+
+if __name__ == '__main__':
+    _pin_hash_seed()
+    sys.exit(main())
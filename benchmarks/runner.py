@@ -0,0 +1,196 @@
+# Name: Eugene Song
+# OSU Email: songeu@oregonstate.edu
+# Course: CS261 - Data Structures
+# Description: Runs HashMap engines against the benchmark workloads and collects ops/sec, per-op latency
+#                   percentiles, peak memory and resize counts. Also compares a run against a saved baseline.
+
+import os
+import platform
+import time
+import tracemalloc
+
+import hash_map_cuckoo
+import hash_map_oa
+import hash_map_rh
+import hash_map_sc
+import hash_map_soa
+from a6_include import (hash_function_1, hash_function_2, hash_fnv1a,
+                        make_siphash, hash_int_mix, hash_builtin)
+from benchmarks.workloads import WORKLOADS
+
+ENGINES = {
+    'sc': hash_map_sc.HashMap,
+    'oa': hash_map_oa.HashMap,
+    'soa': hash_map_soa.HashMap,
+    'rh': hash_map_rh.HashMap,
+    'cuckoo': hash_map_cuckoo.HashMap,
+}
+
+HASH_FUNCTIONS = {
+    'hash_function_1': hash_function_1,
+    'hash_function_2': hash_function_2,
+    'fnv1a': hash_fnv1a,
+    # fixed key instead of a6_include's random one, so every run hashes (and resizes) the same way
+    'siphash': make_siphash(0x0706050403020100, 0x0f0e0d0c0b0a0908),
+    'int_mix': hash_int_mix,
+    'builtin': hash_builtin,
+}
+
+# hash str keys through the built-in hash(), so they only repeat between runs sharing a PYTHONHASHSEED
+SEEDED_FUNCTIONS = ('int_mix', 'builtin')
+
+
+def _count_resizes(hash_map) -> list:
+    """
+    -Wraps resize_table (and the OA map's incremental _start_migration) on this one instance so every
+    call made by the map itself is counted.
+
+    Parameters:
+        hash_map: map to instrument
+
+    Returns:
+        list: single-element counter, updated in place
+    """
+    counter = [0]
+    for name in ('resize_table', '_start_migration'):
+        method = getattr(hash_map, name, None)
+        if method is None:
+            continue
+
+        def counted(new_capacity, _method=method):
+            counter[0] += 1
+            return _method(new_capacity)
+
+        setattr(hash_map, name, counted)
+    return counter
+
+
+def _apply(hash_map, operation: tuple) -> None:
+    """
+    -Runs one workload operation against the map.
+    """
+    if operation[0] == 'put':
+        hash_map.put(operation[1], operation[2])
+    elif operation[0] == 'get':
+        hash_map.get(operation[1])
+    else:
+        hash_map.remove(operation[1])
+
+
+def _percentile(ordered: list, fraction: float) -> float:
+    """
+    -Nearest-rank percentile of an already sorted list.
+    """
+    return ordered[min(int(fraction * len(ordered)), len(ordered) - 1)]
+
+
+def run_benchmark(engine: str, function: str, workload: str, ops: int = 5000, seed: int = 0,
+                  capacity: int = 64) -> dict:
+    """
+    -Runs one engine/hash function/workload combination. The ops are timed in one pass and replayed
+    on a fresh map under tracemalloc in a second pass, so memory tracing does not skew the timings.
+
+    Parameters:
+        engine(str): key of ENGINES
+        function(str): key of HASH_FUNCTIONS
+        workload(str): key of WORKLOADS
+        ops(int): number of operations
+        seed(int): workload seed
+        capacity(int): starting capacity of the map
+
+    Returns:
+        dict: ops_per_sec, p50_us, p99_us, peak_kib and resizes for the run
+    """
+    operations = WORKLOADS[workload](ops, seed)
+    engine_class, hash_function = ENGINES[engine], HASH_FUNCTIONS[function]
+
+    # ------ timing pass ------
+    hash_map = engine_class(capacity, hash_function)
+    resizes = _count_resizes(hash_map)
+    latencies = []
+    clock = time.perf_counter_ns
+    start = clock()
+    for operation in operations:
+        began = clock()
+        _apply(hash_map, operation)
+        latencies.append(clock() - began)
+    elapsed = clock() - start
+    latencies.sort()
+
+    # ------ memory pass ------
+    tracemalloc.start()
+    hash_map = engine_class(capacity, hash_function)
+    for operation in operations:
+        _apply(hash_map, operation)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        'engine': engine,
+        'hash': function,
+        'workload': workload,
+        'ops': len(operations),
+        'ops_per_sec': round(len(operations) / (elapsed / 1e9), 1),
+        'p50_us': round(_percentile(latencies, 0.50) / 1000, 3),
+        'p99_us': round(_percentile(latencies, 0.99) / 1000, 3),
+        'peak_kib': round(peak / 1024, 1),
+        'resizes': resizes[0],
+        'final_capacity': hash_map.get_capacity(),
+    }
+
+
+def run_suite(engines: list, functions: list, workloads: list, ops: int = 5000, seed: int = 0,
+              capacity: int = 64) -> dict:
+    """
+    -Runs every engine x hash function x workload combination.
+
+    Returns:
+        dict: {'meta': run settings, 'results': list of run_benchmark() dicts}
+    """
+    results = []
+    for engine in engines:
+        for function in functions:
+            for workload in workloads:
+                results.append(run_benchmark(engine, function, workload, ops, seed, capacity))
+    return {
+        'meta': {'python': platform.python_version(), 'ops': ops, 'seed': seed, 'capacity': capacity,
+                 'hash_seed': os.environ.get('PYTHONHASHSEED')},
+        'results': results,
+    }
+
+
+def compare(baseline: dict, current: dict, threshold: float = 0.10) -> list:
+    """
+    -Flags results of current that got worse than baseline by more than threshold (a fraction):
+    lower ops/sec, higher p99 latency or higher peak memory. Any extra resize counts as a regression.
+    Combinations missing from either run are skipped, and so are SEEDED_FUNCTIONS unless both runs pinned
+    the same PYTHONHASHSEED (otherwise their keys land in different buckets from run to run).
+
+    Parameters:
+        baseline(dict): saved run_suite() output
+        current(dict): new run_suite() output
+        threshold(float): tolerated relative change
+
+    Returns:
+        list: one message per regression --> empty if none
+    """
+    saved = {(r['engine'], r['hash'], r['workload']): r for r in baseline['results']}
+    hash_seed = current['meta'].get('hash_seed')
+    same_hash_seed = hash_seed not in (None, 'random') and baseline['meta'].get('hash_seed') == hash_seed
+
+    regressions = []
+    for result in current['results']:
+        name = (result['engine'], result['hash'], result['workload'])
+        before = saved.get(name)
+        if before is None or (result['hash'] in SEEDED_FUNCTIONS and not same_hash_seed):
+            continue
+        label = '/'.join(name)
+        if result['ops_per_sec'] < before['ops_per_sec'] * (1 - threshold):
+            regressions.append(f"{label}: ops/sec {before['ops_per_sec']} -> {result['ops_per_sec']}")
+        if result['p99_us'] > before['p99_us'] * (1 + threshold):
+            regressions.append(f"{label}: p99 {before['p99_us']}us -> {result['p99_us']}us")
+        if result['peak_kib'] > before['peak_kib'] * (1 + threshold):
+            regressions.append(f"{label}: peak memory {before['peak_kib']}KiB -> {result['peak_kib']}KiB")
+        if result['resizes'] > before['resizes']:
+            regressions.append(f"{label}: resizes {before['resizes']} -> {result['resizes']}")
+    return regressions
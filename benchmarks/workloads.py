@@ -0,0 +1,102 @@
+# Name: Eugene Song
+# OSU Email: songeu@oregonstate.edu
+# Course: CS261 - Data Structures
+# Description: Workload generators for the HashMap benchmarks. Each workload is a function of (ops, seed) that
+#                   returns a list of operations: ('put', key, value), ('get', key) or ('remove', key).
+
+import itertools
+import random
+
+
+def uniform(ops: int, seed: int) -> list:
+    """
+    -Half puts, half gets, keys drawn uniformly from a keyspace as large as the op count.
+    """
+    rnd = random.Random(seed)
+    workload = []
+    for i in range(ops):
+        key = 'key' + str(rnd.randrange(ops))
+        workload.append(('put', key, i) if rnd.random() < 0.5 else ('get', key))
+    return workload
+
+
+def zipf(ops: int, seed: int, skew: float = 1.1) -> list:
+    """
+    -30% puts, 70% gets, keys drawn from a Zipf distribution so a few hot keys take most of the traffic.
+    """
+    rnd = random.Random(seed)
+    keyspace = max(ops // 2, 1)
+    weights = [1 / (rank ** skew) for rank in range(1, keyspace + 1)]
+    ranks = rnd.choices(range(keyspace), weights=weights, k=ops)
+    workload = []
+    for i in range(ops):
+        key = 'key' + str(ranks[i])
+        workload.append(('put', key, i) if rnd.random() < 0.3 else ('get', key))
+    return workload
+
+
+def sequential(ops: int, seed: int) -> list:
+    """
+    -Puts 'str' + i keys in order, then gets each of them back (the PDF example pattern).
+    """
+    half = ops // 2
+    workload = [('put', 'str' + str(i), i) for i in range(half)]
+    workload += [('get', 'str' + str(i)) for i in range(ops - half)]
+    return workload
+
+
+def anagram(ops: int, seed: int) -> list:
+    """
+    -Puts anagrams of one word, then gets them back in shuffled order. Every key has the same letters,
+    which is the worst case for hash_function_1.
+    """
+    rnd = random.Random(seed)
+    half = ops // 2
+    keys = [''.join(letters) for letters in itertools.islice(itertools.permutations('abcdefghij'), half)]
+    workload = [('put', key, i) for i, key in enumerate(keys)]
+    lookups = keys * (((ops - half) // max(len(keys), 1)) + 1)
+    rnd.shuffle(lookups)
+    workload += [('get', key) for key in lookups[:ops - half]]
+    return workload
+
+
+def churn(ops: int, seed: int, window: int = 256) -> list:
+    """
+    -Delete-heavy churn: every put of a new key removes the key put window steps earlier, with a get of
+    a recent key in between. The live set stays small while tombstones (OA) pile up.
+    """
+    rnd = random.Random(seed)
+    workload = []
+    i = 0
+    while len(workload) < ops:
+        workload.append(('put', 'session' + str(i), i))
+        if i >= window:
+            workload.append(('remove', 'session' + str(i - window)))
+        workload.append(('get', 'session' + str(i - rnd.randrange(min(i, window) + 1))))
+        i += 1
+    return workload[:ops]
+
+
+def read_mostly(ops: int, seed: int) -> list:
+    """
+    -Preloads a tenth of the ops as puts, then 95% gets (a third of them misses) and 5% updates.
+    """
+    rnd = random.Random(seed)
+    preload = max(ops // 10, 1)
+    workload = [('put', 'item' + str(i), i) for i in range(preload)]
+    while len(workload) < ops:
+        if rnd.random() < 0.05:
+            workload.append(('put', 'item' + str(rnd.randrange(preload)), len(workload)))
+        else:
+            workload.append(('get', 'item' + str(rnd.randrange(preload * 3 // 2))))
+    return workload
+
+
+WORKLOADS = {
+    'uniform': uniform,
+    'zipf': zipf,
+    'sequential': sequential,
+    'anagram': anagram,
+    'churn': churn,
+    'read_mostly': read_mostly,
+}
@@ -0,0 +1,107 @@
+# Name: Eugene Song
+# OSU Email: songeu@oregonstate.edu
+# Course: CS261 - Data Structures
+# Description: A Bloom filter over the full hashes the HashMaps already cache, kept alongside a map
+#                   (bloom_bits option) so lookups of absent keys can answer without walking a chain
+#                       or a probe sequence.
+
+from a6_include import hash_int_mix
+
+
+class BloomFilter:
+    def __init__(self, bits: int, probes: int = 3) -> None:
+        """
+        Initialize empty filter of (at least 8) bits, setting probes bits per hash added
+            - bit positions come from hash_int_mix() of the full hash (double hashing), so nothing is
+                rehashed and the positions do not follow the map's bucket index
+            - keys sharing a full hash share their bits, so the filter can only tell apart keys the map's
+                hash function tells apart (hash_function_1/2 give many keys the same hash; hash_fnv1a does not)
+            - nothing can be taken out: a removed key leaves its bits set until the owner rebuilds the filter
+        """
+        self._size = max(bits, 8)
+        self._bits = bytearray((self._size + 7) // 8)
+        self._probes = probes
+        # add() calls so far, repeats included
+        self._count = 0
+
+    def get_bits(self) -> int:
+        """
+        Return number of bits in the filter
+        """
+        return self._size
+
+    def get_probes(self) -> int:
+        """
+        Return number of bits set per hash
+        """
+        return self._probes
+
+    def get_count(self) -> int:
+        """
+        Return number of hashes added (repeats included)
+        """
+        return self._count
+
+    def fill_ratio(self) -> float:
+        """
+        Return fraction of bits set (a false positive takes probes set bits, about fill_ratio ** probes)
+        """
+        return sum(bin(byte).count('1') for byte in self._bits) / self._size
+
+    def add(self, hash_val: int) -> None:
+        """
+        -Sets the bits of a full hash.
+
+        Parameters:
+            self(BloomFilter)
+            hash_val(int): full hash of the key being added
+
+        Returns:
+            None
+        """
+        self._count += 1
+        bits, size = self._bits, self._size
+        position = hash_int_mix(hash_val)
+        step = (position >> 32) | 1
+        for _ in range(self._probes):
+            index = position % size
+            bits[index >> 3] |= 1 << (index & 7)
+            position += step
+
+    def might_contain(self, hash_val: int) -> bool:
+        """
+        -Checks the bits of a full hash.
+
+        Parameters:
+            self(BloomFilter)
+            hash_val(int): full hash of the key searched for
+
+        Returns:
+            bool: False if no key with this hash was added --> True if one may have been
+        """
+        bits, size = self._bits, self._size
+        position = hash_int_mix(hash_val)
+        step = (position >> 32) | 1
+        for _ in range(self._probes):
+            index = position % size
+            if not bits[index >> 3] & (1 << (index & 7)):
+                return False
+            position += step
+        return True
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+
+if __name__ == "__main__":
+
+    from a6_include import hash_fnv1a
+
+    print("\nno false negatives, false positive rate at 16 bits per key")
+    print("----------------------------------------------------------")
+    f = BloomFilter(16 * 1000)
+    for i in range(1000):
+        f.add(hash_fnv1a('str' + str(i)))
+    print(all(f.might_contain(hash_fnv1a('str' + str(i))) for i in range(1000)))
+    misses = sum(f.might_contain(hash_fnv1a('absent' + str(i))) for i in range(10000))
+    print(misses / 10000 < 0.02, round(f.fill_ratio(), 2))
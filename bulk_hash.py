@@ -0,0 +1,222 @@
+# Name: Eugene Song
+# OSU Email: songeu@oregonstate.edu
+# Course: CS261 - Data Structures
+# Description: Optional NumPy-backed bulk hashing for the HashMap batch operations. A whole batch of keys is
+#                   hashed in one vectorized pass and ordered by bucket, giving exactly the same hashes as
+#                       calling the hash function key by key. Without NumPy everything falls back to plain
+#                           Python loops.
+
+
+from a6_include import (hash_function_1, hash_function_2,
+                        hash_fnv1a, hash_int_mix)
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def _as_str_matrix(keys):
+    """
+    -Turns a batch of str keys into an (n, width) matrix of code points, zero padded on the right.
+    Padding adds nothing to hash_function_1 or hash_function_2, so both can be summed straight across rows.
+
+    Parameters:
+        keys(list or np.ndarray): str keys, or a 1-D NumPy 'U' array
+
+    Returns:
+        np.ndarray: uint32 code points --> None if keys are not all str (bytes keys, 'S' arrays included,
+        are left to the hash function itself, which sees str(key) rather than the bytes)
+    """
+    if isinstance(keys, np.ndarray):
+        if keys.dtype.kind != 'U' or keys.ndim != 1:
+            return None
+        array = keys
+    else:
+        if not all(type(key) is str or type(key) is np.str_ for key in keys):
+            return None
+        array = np.array(keys, dtype=str)
+
+    width = array.dtype.itemsize // 4
+    if width == 0:
+        return np.zeros((len(array), 0), dtype=np.uint32)
+    return array.view(np.uint32).reshape(len(array), width)
+
+
+def _int_array(keys):
+    """
+    -Returns the keys as an int64 array if every key is a (non-bool) int that fits, otherwise None.
+    """
+    if isinstance(keys, np.ndarray):
+        return keys.astype(np.int64) if keys.dtype.kind in 'iu' and keys.ndim == 1 else None
+    if not all(type(key) is int for key in keys):
+        return None
+    try:
+        return np.array(keys, dtype=np.int64)
+    except OverflowError:
+        return None
+
+
+def _fnv1a_matrix(keys):
+    """
+    -64-bit FNV-1a (with the high-half fold of a6_include.hash_fnv1a) over the UTF-8 bytes of str(key),
+    one byte column at a time. Rows shorter than the column being processed are left untouched.
+
+    Parameters:
+        keys(list or np.ndarray): str or int keys
+
+    Returns:
+        np.ndarray: uint64 hashes --> None for any other kind of key
+    """
+    if isinstance(keys, np.ndarray):
+        keys = keys.tolist()
+    if not all(type(key) is str or type(key) is int for key in keys):
+        return None
+
+    encoded = [str(key).encode() for key in keys]
+    lengths = np.array([len(data) for data in encoded], dtype=np.int64)
+    width = int(lengths.max()) if len(encoded) else 0
+    data = np.array(encoded, dtype='S' + str(max(width, 1))).view(np.uint8).reshape(len(encoded), -1)
+
+    hashes = np.full(len(encoded), 0xcbf29ce484222325, dtype=np.uint64)
+    prime = np.uint64(0x100000001b3)
+    for column in range(width):
+        active = lengths > column
+        hashes = np.where(active, (hashes ^ data[:, column]) * prime, hashes)
+    return hashes ^ (hashes >> np.uint64(32))
+
+
+def _int_mix_array(keys):
+    """
+    -splitmix64 finalizer of a6_include.hash_int_mix applied to a whole int64 array in uint64 arithmetic.
+    """
+    ints = _int_array(keys)
+    if ints is None:
+        return None
+    x = ints.view(np.uint64)
+    x = (x ^ (x >> np.uint64(30))) * np.uint64(0xbf58476d1ce4e5b9)
+    x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94d049bb133111eb)
+    return x ^ (x >> np.uint64(31))
+
+
+def vectorized_hashes(keys, function) -> list:
+    """
+    -Hashes a whole batch of keys in one vectorized pass. Supported, and reproduced exactly:
+        - hash_function_1: str keys (int keys through str(key), like the original)
+        - hash_function_2: str keys
+        (str keys may come as a list or as a 1-D NumPy 'U' array, which is used without copying)
+        - hash_fnv1a: str or int keys
+        - hash_int_mix: int keys that fit in 64 bits
+
+    Parameters:
+        keys(list or np.ndarray): batch of keys
+        function: the map's hash function
+
+    Returns:
+        list: full hash of every key as Python ints --> None if NumPy is missing, function has no
+        vectorized form or the keys don't suit it
+    """
+    if np is None or len(keys) == 0:
+        return None
+
+    with np.errstate(over='ignore'):
+        if function is hash_function_1:
+            ints = _int_array(keys)
+            matrix = _as_str_matrix(ints.astype(str) if ints is not None else keys)
+            result = None if matrix is None else matrix.sum(axis=1, dtype=np.int64)
+        elif function is hash_function_2:
+            matrix = _as_str_matrix(keys)
+            weights = None if matrix is None else np.arange(1, matrix.shape[1] + 1, dtype=np.int64)
+            result = None if matrix is None else (matrix * weights).sum(axis=1, dtype=np.int64)
+        elif function is hash_fnv1a:
+            result = _fnv1a_matrix(keys)
+        elif function is hash_int_mix:
+            result = _int_mix_array(keys)
+        else:
+            result = None
+
+    return None if result is None else result.tolist()
+
+
+def as_batch(keys):
+    """
+    -Prepares a batch of keys for hash_all(): a 1-D NumPy array is kept as it is, so its fixed-width
+    vectorized path is used, and any other iterable is read into a list.
+
+    Parameters:
+        keys(iterable or np.ndarray): batch of keys
+
+    Returns:
+        list or np.ndarray: keys, indexable and sized
+    """
+    if np is not None and isinstance(keys, np.ndarray) and keys.ndim == 1:
+        return keys
+    return list(keys)
+
+
+def hash_all(keys, function) -> list:
+    """
+    -Returns the full hash of every key, vectorized when possible and key by key otherwise.
+
+    Parameters:
+        keys(list): batch of keys
+        function: the map's hash function
+
+    Returns:
+        list: full hash of each key, in input order
+    """
+    hashes = vectorized_hashes(keys, function)
+    if hashes is None:
+        hashes = [function(key) for key in keys]
+    return hashes
+
+
+def bucket_order(hashes: list, capacity: int) -> list:
+    """
+    -Returns the positions of hashes sorted by bucket index (hash % capacity). The sort is stable,
+    so positions that share a bucket keep their input order.
+
+    Parameters:
+        hashes(list): full hashes
+        capacity(int): number of buckets
+
+    Returns:
+        list: positions into hashes, grouped by bucket
+    """
+    if np is not None and len(hashes) > 0:
+        try:
+            indices = np.array(hashes, dtype=np.uint64) % np.uint64(capacity)
+        except (OverflowError, TypeError, ValueError):
+            # negative or wider than 64-bit hashes --> Python's % handles those
+            indices = None
+        if indices is not None:
+            return np.argsort(indices, kind='stable').tolist()
+    return sorted(range(len(hashes)), key=lambda i: hashes[i] % capacity)
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+
+if __name__ == "__main__":
+
+    print("\nvectorized hashes match the key-by-key hash functions")
+    print("------------------------------------------------------")
+    str_keys = ['str' + str(i) for i in range(1000)] + ['', 'b', 'ünï', 'key' * 40]
+    int_keys = list(range(-500, 500)) + [2 ** 63 - 1]
+    for function, keys in ((hash_function_1, str_keys), (hash_function_1, int_keys),
+                           (hash_function_2, str_keys), (hash_fnv1a, str_keys),
+                           (hash_fnv1a, int_keys), (hash_int_mix, int_keys)):
+        vectorized = vectorized_hashes(keys, function)
+        if vectorized is None:
+            print(function.__name__, 'no vectorized path (NumPy installed?)')
+        else:
+            print(function.__name__, vectorized == [function(key) for key in keys])
+
+    if np is not None:
+        array = np.array(str_keys)
+        print('U array', hash_all(as_batch(array), hash_function_2) == [hash_function_2(key) for key in str_keys])
+        print('S array', hash_all(as_batch(np.array([b'ab'])), hash_function_1) == [hash_function_1(np.bytes_(b'ab'))])
+
+    print("\nbucket_order groups by bucket and keeps input order inside a bucket")
+    print("-------------------------------------------------------------------")
+    hashes = hash_all(['a', 'b', 'k', 'a'], hash_function_1)
+    print(bucket_order(hashes, 10), [h % 10 for h in hashes])
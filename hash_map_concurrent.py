@@ -0,0 +1,391 @@
+# Name: Eugene Song
+# OSU Email: songeu@oregonstate.edu
+# Course: CS261 - Data Structures
+# Description: A thread-safe Separate Chaining HashMap using lock striping. The table is split into segments, each
+#                   with its own lock, bucket array and size, so put/get/remove on keys of different segments
+#                       never wait on each other. resize_table/clear/get_size take every lock in segment order.
+
+import threading
+
+from a6_include import (DynamicArray, LinkedList,
+                        hash_function_1, hash_function_2)
+
+
+class _Segment:
+    """
+    One lock-protected slice of the table: its own LinkedList buckets and entry count
+    """
+    def __init__(self, capacity: int) -> None:
+        self.lock = threading.Lock()
+        self.buckets = DynamicArray()
+        for _ in range(capacity):
+            self.buckets.append(LinkedList())
+        self.capacity = capacity
+        self.size = 0
+
+
+class HashMap:
+    def __init__(self, capacity: int, function, segments: int = 16, max_load: float = None) -> None:
+        """
+        Initialize new thread-safe HashMap that uses
+        separate chaining for collision resolution
+            - a key's segment is picked by hash % segments and its bucket by (hash // segments) % segment capacity,
+                so moving buckets around inside one segment never changes which lock guards a key
+            - the capacity is split evenly across the segments (at least one bucket each)
+            - growth policy (off unless set): put() doubles only its own segment once that segment's load factor
+                exceeds max_load, holding just that segment's lock
+        """
+        self._segment_count = max(segments, 1)
+        per_segment = max(-(-capacity // self._segment_count), 1)
+        self._segments = [_Segment(per_segment) for _ in range(self._segment_count)]
+
+        self._hash_function = function
+        self._max_load = max_load
+
+    def __str__(self) -> str:
+        """
+        Override string method to provide more readable output
+        """
+        out = ''
+        self._lock_all()
+        try:
+            for number, segment in enumerate(self._segments):
+                for i in range(segment.capacity):
+                    out += str(number) + '.' + str(i) + ': ' + str(segment.buckets[i]) + '\n'
+        finally:
+            self._unlock_all()
+        return out
+
+    def get_size(self) -> int:
+        """
+        Return size of map
+            - every segment is locked while counting, so the result is a consistent snapshot
+        """
+        self._lock_all()
+        try:
+            return sum(segment.size for segment in self._segments)
+        finally:
+            self._unlock_all()
+
+    def get_capacity(self) -> int:
+        """
+        Return capacity of map (total buckets over every segment)
+        """
+        self._lock_all()
+        try:
+            return sum(segment.capacity for segment in self._segments)
+        finally:
+            self._unlock_all()
+
+    # ------------------------------------------------------------------ #
+
+    def _lock_all(self) -> None:
+        """
+        -Helper that acquires every segment lock, always in segment order so two callers cannot deadlock.
+
+        Parameters:
+            self(HashMap)
+
+        Returns:
+            None
+        """
+        for segment in self._segments:
+            segment.lock.acquire()
+
+    def _unlock_all(self) -> None:
+        """
+        -Helper that releases every segment lock taken by _lock_all(), in reverse order.
+
+        Parameters:
+            self(HashMap)
+
+        Returns:
+            None
+        """
+        for segment in reversed(self._segments):
+            segment.lock.release()
+
+    def _bucket(self, segment: _Segment, hash_val: int) -> LinkedList:
+        """
+        -Helper that returns the LinkedList of segment holding hash_val. Caller must hold segment.lock.
+
+        Parameters:
+            self(HashMap)
+            segment(_Segment): segment picked by hash_val
+            hash_val(int): full hash of key
+
+        Returns:
+            LinkedList: bucket for hash_val
+        """
+        return segment.buckets.get_at_index((hash_val // self._segment_count) % segment.capacity)
+
+    @staticmethod
+    def _resize_segment(segment: _Segment, new_capacity: int, segment_count: int) -> None:
+        """
+        -Helper that moves every node of segment into new_capacity buckets using the cached hashes.
+        Caller must hold segment.lock.
+
+        Parameters:
+            segment(_Segment): segment to resize
+            new_capacity(int): new bucket count of segment
+            segment_count(int): number of segments of the map
+
+        Returns:
+            None
+        """
+        new_buckets = DynamicArray()
+        for _ in range(new_capacity):
+            new_buckets.append(LinkedList())
+
+        for each in range(segment.capacity):
+            for node in segment.buckets.get_at_index(each):
+                new_buckets.get_at_index((node.hash // segment_count) % new_capacity).insert(
+                    node.key, node.value, node.hash)
+
+        segment.buckets = new_buckets
+        segment.capacity = new_capacity
+
+    def put(self, key: str, value: object) -> None:
+        """
+        -Updates the key/value pair in hash map. If given key already exists, its associated value must be replaced
+        with the new value. If given key does not exist, a key/value pair must be added.
+            - the key is hashed before the segment lock is taken, so hashing never holds up other threads
+
+        Parameters:
+            self(HashMap)
+            key(str): the identifier
+            value(object): the identifier's value
+
+        Returns:
+            None
+        """
+        hash_val = self._hash_function(key)
+        segment = self._segments[hash_val % self._segment_count]
+
+        with segment.lock:
+            current_bucket = self._bucket(segment, hash_val)
+            node = current_bucket.contains(key, hash_val)
+
+            # key already exists --> update its value
+            if node:
+                node.value = value
+                return
+
+            current_bucket.insert(key, value, hash_val)
+            segment.size += 1
+            # growth policy --> double this segment only
+            if self._max_load is not None and segment.size / segment.capacity > self._max_load:
+                self._resize_segment(segment, segment.capacity * 2, self._segment_count)
+
+    def get(self, key: str) -> object:
+        """
+        -Returns the value associated with given key. If key does not exist --> return None
+
+        Parameters:
+            self(HashMap)
+            key(str): key to search for
+
+        Returns:
+            object: value associated with given key
+        """
+        hash_val = self._hash_function(key)
+        segment = self._segments[hash_val % self._segment_count]
+
+        with segment.lock:
+            node = self._bucket(segment, hash_val).contains(key, hash_val)
+            if node is None:
+                return None
+            return node.value
+
+    def contains_key(self, key: str) -> bool:
+        """
+        -Returns True if given key exists in the hash map, otherwise return False.
+
+        Parameters:
+            self(HashMap)
+            key(str): key to search for
+
+        Returns:
+            bool: whether key exists or not
+        """
+        hash_val = self._hash_function(key)
+        segment = self._segments[hash_val % self._segment_count]
+
+        with segment.lock:
+            return self._bucket(segment, hash_val).contains(key, hash_val) is not None
+
+    def remove(self, key: str) -> None:
+        """
+        -Removes the given key and its associated value from the hash map. If key does not exist --> do nothing
+
+        Parameters:
+            self(HashMap)
+            key(str): key to remove
+
+        Returns:
+            None
+        """
+        hash_val = self._hash_function(key)
+        segment = self._segments[hash_val % self._segment_count]
+
+        with segment.lock:
+            if self._bucket(segment, hash_val).remove(key, hash_val):
+                segment.size -= 1
+
+    def empty_buckets(self) -> int:
+        """
+        -Returns the number of empty "buckets" in the hash table.
+
+        Parameters:
+            self(HashMap)
+
+        Returns:
+            int: number of empty buckets
+        """
+        buckets = 0
+        self._lock_all()
+        try:
+            for segment in self._segments:
+                for each in range(segment.capacity):
+                    if segment.buckets.get_at_index(each).length() == 0:
+                        buckets += 1
+        finally:
+            self._unlock_all()
+        return buckets
+
+    def table_load(self) -> float:
+        """
+        -Returns the current hash table's load factor.
+                load factor = # of total elements in table / # of buckets
+        Parameters:
+            self(HashMap)
+
+        Returns:
+            float: load factor for hash table
+        """
+        self._lock_all()
+        try:
+            size = sum(segment.size for segment in self._segments)
+            capacity = sum(segment.capacity for segment in self._segments)
+        finally:
+            self._unlock_all()
+        return size / capacity
+
+    def clear(self) -> None:
+        """
+        -Clears the contents of hash map. Does not change the underlying hash table capacity.
+
+        Parameters:
+            self(HashMap)
+
+        Returns:
+            None
+        """
+        self._lock_all()
+        try:
+            for segment in self._segments:
+                for each in range(segment.capacity):
+                    segment.buckets.set_at_index(each, LinkedList())
+                segment.size = 0
+        finally:
+            self._unlock_all()
+
+    def resize_table(self, new_capacity: int) -> None:
+        """
+        -Changes the capacity of the internal hash table, split evenly across the segments. All existing
+        key/value pairs remain and are moved using their cached hashes. If new capacity is < 1 --> do nothing
+            - every segment lock is taken (in segment order) for the whole resize
+
+        Parameters:
+            self(HashMap)
+            new_capacity(int): new internal capacity
+
+        Returns:
+            None
+        """
+        if new_capacity < 1:
+            return
+
+        per_segment = max(-(-new_capacity // self._segment_count), 1)
+        self._lock_all()
+        try:
+            for segment in self._segments:
+                self._resize_segment(segment, per_segment, self._segment_count)
+        finally:
+            self._unlock_all()
+
+    def get_keys(self) -> DynamicArray:
+        """
+        -Returns a DynamicArray that contains all the keys stored in the hash map. Order does not matter.
+            - every segment is locked while collecting, so the keys are a consistent snapshot
+
+        Parameters:
+            self(HashMap)
+
+        Returns:
+            DynamicArray: all keys
+        """
+        keys = DynamicArray()
+        self._lock_all()
+        try:
+            for segment in self._segments:
+                for each in range(segment.capacity):
+                    for node in segment.buckets.get_at_index(each):
+                        keys.append(node.key)
+        finally:
+            self._unlock_all()
+        return keys
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+
+if __name__ == "__main__":
+
+    print("\nPDF - put example 1")
+    print("-------------------")
+    m = HashMap(50, hash_function_1)
+    for i in range(150):
+        m.put('str' + str(i), i * 100)
+        if i % 25 == 24:
+            print(m.empty_buckets(), round(m.table_load(), 2), m.get_size(), m.get_capacity())
+
+    print("\nPDF - resize example 2")
+    print("----------------------")
+    m = HashMap(75, hash_function_2)
+    keys = [i for i in range(1, 1000, 13)]
+    for key in keys:
+        m.put(str(key), key * 42)
+    print(m.get_size(), m.get_capacity())
+
+    for capacity in range(111, 1000, 117):
+        m.resize_table(capacity)
+
+        m.put('some key', 'some value')
+        result = m.contains_key('some key')
+        m.remove('some key')
+
+        for key in keys:
+            # all inserted keys must be present
+            result &= m.contains_key(str(key))
+            # NOT inserted keys must be absent
+            result &= not m.contains_key(str(key + 1))
+        print(capacity, result, m.get_size(), m.get_capacity(), round(m.table_load(), 2))
+
+    print("\nthreaded put/get/remove")
+    print("-----------------------")
+    m = HashMap(64, hash_function_2, max_load=1.0)
+
+    def worker(start: int) -> None:
+        for i in range(start, start + 1000):
+            m.put('key' + str(i), i)
+        for i in range(start, start + 1000, 2):
+            m.remove('key' + str(i))
+
+    threads = [threading.Thread(target=worker, args=(n * 1000,)) for n in range(8)]
+    for thread in threads:
+        thread.start()
+    m.resize_table(200)
+    for thread in threads:
+        thread.join()
+    print(m.get_size(), m.get('key1'), m.get('key2'), m.contains_key('key7999'), m.get_capacity() >= 200)
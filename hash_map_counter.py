@@ -0,0 +1,257 @@
+# Name: Eugene Song
+# OSU Email: songeu@oregonstate.edu
+# Course: CS261 - Data Structures
+# Description: A counting map (multiset) on the chaining or open addressing HashMap. increment() hashes its key
+#                   once and finds or creates the entry in a single chain walk / probe sequence, and
+#                       merge()/subtract() reuse the other counter's cached hashes when both share a hash function.
+
+import heapq
+
+import hash_map_sc
+from a6_include import (DynamicArray,
+                        hash_function_1, hash_function_2)
+
+
+def _hashed_entries(engine_map):
+    """
+    -Generator over the live entries (SLNode or HashEntry, both carrying key, value and hash) of a chaining or
+    open addressing map.
+
+    Parameters:
+        engine_map(HashMap): hash_map_sc or hash_map_oa map
+
+    Yields:
+        SLNode or HashEntry: each live entry
+    """
+    if hasattr(engine_map, '_nodes'):
+        return engine_map._nodes()
+    return engine_map._live_entries()
+
+
+class Counter:
+    def __init__(self, capacity: int, function, engine=hash_map_sc.HashMap, **options) -> None:
+        """
+        Initialize new empty Counter
+            - engine is the HashMap class holding the counts (hash_map_sc.HashMap or hash_map_oa.HashMap,
+                or one of their subclasses), built with capacity, function and options
+            - counts can reach 0 or go negative through subtract(); remove() drops a key
+        """
+        self._map = engine(capacity, function, **options)
+        self._hash_function = function
+
+    def __str__(self) -> str:
+        """
+        Override string method to provide more readable output
+        """
+        return str(self._map)
+
+    def __iter__(self):
+        """
+        Iterate over the keys of the counter
+        """
+        return iter(self._map)
+
+    def get_size(self) -> int:
+        """
+        Return number of distinct keys counted
+        """
+        return self._map.get_size()
+
+    def get_capacity(self) -> int:
+        """
+        Return capacity of map
+        """
+        return self._map.get_capacity()
+
+    # ------------------------------------------------------------------ #
+
+    def increment(self, key: str, delta: int = 1) -> int:
+        """
+        -Adds delta to the count of key, starting from 0 if key DNE. The key is hashed once and its entry is
+        found or created in the same walk.
+
+        Parameters:
+            self(Counter)
+            key(str): key to count
+            delta(int): amount to add (negative to take away)
+
+        Returns:
+            int: new count of key
+        """
+        return self._map._add_count(key, self._hash_function(key), delta)
+
+    def get(self, key: str) -> int:
+        """
+        Returns count of given key --> 0 if DNE
+
+        Parameters:
+            self(Counter)
+            key(str): key we are searching for
+
+        Returns:
+            int: count of key
+        """
+        count = self._map.get(key)
+        return 0 if count is None else count
+
+    def contains_key(self, key: str) -> bool:
+        """
+        Returns True if key has been counted (and not removed)
+        """
+        return self._map.contains_key(key)
+
+    def remove(self, key: str) -> None:
+        """
+        Removes given key and its count. If key DNE --> do nothing
+        """
+        self._map.remove(key)
+
+    def clear(self) -> None:
+        """
+        Clears every count. Do not touch underlying hash table capacity.
+        """
+        self._map.clear()
+
+    def table_load(self) -> float:
+        """
+        Returns the current hash table's load factor
+        """
+        return self._map.table_load()
+
+    def empty_buckets(self) -> int:
+        """
+        Returns the number of empty buckets
+        """
+        return self._map.empty_buckets()
+
+    def resize_table(self, new_capacity: int) -> None:
+        """
+        Changes the capacity of the underlying hash table
+        """
+        self._map.resize_table(new_capacity)
+
+    def get_keys(self) -> DynamicArray:
+        """
+        Returns a DynamicArray that contains all counted keys. Order does not matter.
+        """
+        return self._map.get_keys()
+
+    def items(self):
+        """
+        Iterate over (key, count) tuples
+        """
+        return self._map.items()
+
+    def total(self) -> int:
+        """
+        Returns sum of all counts
+        """
+        return sum(entry.value for entry in _hashed_entries(self._map))
+
+    # ------------------------------------------------------------------ #
+
+    def most_common(self, k: int = None) -> DynamicArray:
+        """
+        -Returns the k keys with the highest counts. Ties keep no particular order.
+            - k smaller than the number of keys keeps a heap of k entries instead of sorting every key
+
+        Parameters:
+            self(Counter)
+            k(int): number of keys to return --> every key if None
+
+        Returns:
+            DynamicArray: (key, count) tuples, highest count first
+        """
+        pairs = ((entry.key, entry.value) for entry in _hashed_entries(self._map))
+        if k is None or k >= self.get_size():
+            return DynamicArray(sorted(pairs, key=lambda pair: pair[1], reverse=True))
+        return DynamicArray(heapq.nlargest(max(k, 0), pairs, key=lambda pair: pair[1]))
+
+    def _add_all(self, other, sign: int) -> None:
+        """
+        -Helper for merge() and subtract(): adds (sign = 1) or takes away (sign = -1) the counts of other.
+            - a Counter or HashMap of counts sharing this counter's hash function hands over its cached hashes,
+                so no key is hashed again
+            - any other iterable is a stream of keys, each counted once
+
+        Parameters:
+            self(Counter)
+            other(Counter, HashMap or iterable): counts or keys to apply
+            sign(int): 1 to add, -1 to take away
+
+        Returns:
+            None
+        """
+        add_count = self._map._add_count
+        function = self._hash_function
+
+        if isinstance(other, Counter):
+            other = other._map
+        if hasattr(other, '_hash_function'):
+            entries = list(_hashed_entries(other))
+            if other._hash_function is function:
+                for entry in entries:
+                    add_count(entry.key, entry.hash, sign * entry.value)
+            else:
+                for entry in entries:
+                    add_count(entry.key, function(entry.key), sign * entry.value)
+            return
+
+        for key in hash_map_sc._values_of(other):
+            add_count(key, function(key), sign)
+
+    def merge(self, other) -> None:
+        """
+        -Adds the counts of other to this counter.
+
+        Parameters:
+            self(Counter)
+            other(Counter, HashMap or iterable): a Counter, a chaining / open addressing map of counts,
+                or keys (DynamicArray or iterable) to count once each
+
+        Returns:
+            None
+        """
+        self._add_all(other, 1)
+
+    def subtract(self, other) -> None:
+        """
+        -Takes the counts of other away from this counter. Keys reaching 0 or below are kept with that count.
+
+        Parameters:
+            self(Counter)
+            other(Counter, HashMap or iterable): a Counter, a chaining / open addressing map of counts,
+                or keys (DynamicArray or iterable) to take away once each
+
+        Returns:
+            None
+        """
+        self._add_all(other, -1)
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+
+if __name__ == "__main__":
+
+    import hash_map_oa
+
+    print("\nincrement and most_common")
+    print("-------------------------")
+    for engine in (hash_map_sc.HashMap, hash_map_oa.HashMap):
+        c = Counter(10, hash_function_1, engine)
+        for i in range(1000):
+            c.increment('str' + str(i % 37 % 11))
+        print(engine.__module__, c.get_size(), c.total(), c.most_common(3))
+
+    print("\nmerge and subtract")
+    print("------------------")
+    a = Counter(10, hash_function_2)
+    a.merge(DynamicArray(['a', 'b', 'b', 'c', 'c', 'c']))
+    b = Counter(10, hash_function_2, hash_map_oa.HashMap)
+    b.merge(['c', 'd', 'd'])
+    a.merge(b)
+    print(a.most_common(), a.get('d'), a.get('missing'))
+    a.subtract(b)
+    a.subtract(['a'])
+    print(a.most_common(), a.contains_key('a'), a.get('a'))
@@ -0,0 +1,500 @@
+# Name: Eugene Song
+# OSU Email: songeu@oregonstate.edu
+# Course: CS261 - Data Structures
+# Description: A HashMap implemented with bucketized cuckoo hashing. Every key has one 4-slot bucket in each of
+#                   two tables, picked by two hash functions, so get/contains_key read at most two buckets.
+#                       put() makes room by moving residents to their other bucket, and rehashes into a larger
+#                           table when a bounded number of moves is not enough.
+
+import random
+
+from a6_include import (DynamicArray, HashEntry,
+                        hash_function_1, hash_function_2, hash_fnv1a, hash_int_mix, make_siphash)
+
+# entries per bucket
+_SLOTS = 4
+# entries the stash may hold before put() rehashes --> keeps a miss to two buckets plus a short scan
+_STASH_LIMIT = 8
+
+
+class HashMap:
+    def __init__(self, capacity: int, function, function2=None, max_load: float = 0.9,
+                 max_kicks: int = 100) -> None:
+        """
+        Initialize new HashMap that uses
+        bucketized cuckoo hashing for collision resolution
+            - a key's bucket in the first table comes from function, in the second from function2
+                (default: hash_fnv1a, or hash_int_mix when function is hash_fnv1a); the two must be
+                independent, well-mixed hashes --> hash_function_1/2 are not
+            - capacity counts slots and is rounded up to whole buckets in both tables (multiples of 8)
+            - put() doubles the table once storing another entry would push the load factor past max_load
+            - an insert moves at most max_kicks residents; an entry still left without a slot waits in a stash
+                that lookups check after the two buckets, kept to 8 entries by rehashing (see put())
+        """
+        if function2 is None:
+            function2 = hash_int_mix if function is hash_fnv1a else hash_fnv1a
+
+        self._hash_function = function
+        self._function2 = function2
+        # which of the two functions has been replaced by a keyed SipHash after the stash overflowed
+        self._replaced = [False, False]
+        self._max_load = max_load
+        self._max_kicks = max_kicks
+        self._size = 0
+
+        # picks the resident to move when both buckets are full --> seeded so runs are repeatable
+        self._random = random.Random(0)
+        self._allocate(capacity)
+
+    def __str__(self) -> str:
+        """
+        Override string method to provide more readable output
+        """
+        out = ''
+        for number in range(2):
+            table = self._tables[number]
+            for i in range(table.length()):
+                out += f"T{number + 1} {i}: {table.get_at_index(i)}\n"
+        for i in range(self._stash.length()):
+            out += f"stash {i}: {self._stash.get_at_index(i)}\n"
+        return out
+
+    def get_size(self) -> int:
+        """
+        Return size of map
+        """
+        return self._size
+
+    def get_capacity(self) -> int:
+        """
+        Return capacity of map (slots in both tables)
+        """
+        return self._capacity
+
+    def get_stash_size(self) -> int:
+        """
+        Return number of entries waiting in the stash
+        """
+        return self._stash.length()
+
+    # ------------------------------------------------------------------ #
+
+    def _allocate(self, capacity: int) -> None:
+        """
+        -Replaces both tables and the stash with empty ones holding at least capacity slots.
+
+        Parameters:
+            self(HashMap)
+            capacity(int): minimum number of slots
+
+        Returns:
+            None
+        """
+        self._bucket_count = max(-(-capacity // (2 * _SLOTS)), 1)
+        self._capacity = 2 * _SLOTS * self._bucket_count
+        self._tables = (DynamicArray([None] * (_SLOTS * self._bucket_count)),
+                        DynamicArray([None] * (_SLOTS * self._bucket_count)))
+        self._stash = DynamicArray()
+
+    def _bucket_start(self, number: int, entry: HashEntry) -> int:
+        """
+        -Returns the first slot of entry's bucket in table number, using its cached hashes.
+
+        Parameters:
+            self(HashMap)
+            number(int): 0 for the first table, 1 for the second
+            entry(HashEntry): entry to place
+
+        Returns:
+            int: slot index of the bucket start
+        """
+        hash_val = entry.hash if number == 0 else entry.hash2
+        return (hash_val % self._bucket_count) * _SLOTS
+
+    def _locate(self, key: str, hash_val: int, hash2: int = None) -> tuple:
+        """
+        -Returns where key is stored: its bucket in the first table, then its bucket in the second table,
+        then the stash (normally empty).
+            - hash2 is only computed if key is not in its first bucket
+
+        Parameters:
+            self(HashMap)
+            key(str): key we are searching for
+            hash_val(int): full hash of key from function
+            hash2(int): full hash of key from function2, if already known
+
+        Returns:
+            tuple: (table, slot) --> table 0 or 1, or 2 for (stash, index); None if key DNE
+        """
+        table = self._tables[0]
+        start = (hash_val % self._bucket_count) * _SLOTS
+        for slot in range(start, start + _SLOTS):
+            entry = table.get_at_index(slot)
+            # cached hash compared before the key
+            if entry is not None and entry.hash == hash_val and entry.key == key:
+                return 0, slot
+
+        if hash2 is None:
+            hash2 = self._function2(key)
+        table = self._tables[1]
+        start = (hash2 % self._bucket_count) * _SLOTS
+        for slot in range(start, start + _SLOTS):
+            entry = table.get_at_index(slot)
+            if entry is not None and entry.hash2 == hash2 and entry.key == key:
+                return 1, slot
+
+        for index in range(self._stash.length()):
+            entry = self._stash.get_at_index(index)
+            if entry.hash == hash_val and entry.key == key:
+                return 2, index
+        return None
+
+    def _entry_at(self, location: tuple) -> HashEntry:
+        """
+        -Returns the entry stored at a location found by _locate().
+
+        Parameters:
+            self(HashMap)
+            location(tuple): (table, slot) from _locate()
+
+        Returns:
+            HashEntry: entry at location
+        """
+        if location[0] == 2:
+            return self._stash.get_at_index(location[1])
+        return self._tables[location[0]].get_at_index(location[1])
+
+    def _store_free(self, number: int, entry: HashEntry) -> bool:
+        """
+        -Stores entry in a free slot of its bucket in table number, if there is one.
+
+        Parameters:
+            self(HashMap)
+            number(int): 0 for the first table, 1 for the second
+            entry(HashEntry): entry to place
+
+        Returns:
+            bool: True if entry was stored
+        """
+        table = self._tables[number]
+        start = self._bucket_start(number, entry)
+        for slot in range(start, start + _SLOTS):
+            if table.get_at_index(slot) is None:
+                table.set_at_index(slot, entry)
+                return True
+        return False
+
+    def _insert(self, entry: HashEntry) -> HashEntry:
+        """
+        -Places an entry whose key is not in the map. If both its buckets are full, it takes the slot of a
+        random resident, which moves on to its bucket in the other table, and so on for up to max_kicks moves.
+
+        Parameters:
+            self(HashMap)
+            entry(HashEntry): entry to place
+
+        Returns:
+            HashEntry: entry left without a slot after max_kicks moves --> None if everything was placed
+        """
+        if self._store_free(0, entry) or self._store_free(1, entry):
+            return None
+
+        number = 0
+        for _ in range(self._max_kicks):
+            # evict a random resident of entry's (full) bucket and carry it to its other table
+            slot = self._bucket_start(number, entry) + self._random.randrange(_SLOTS)
+            table = self._tables[number]
+            entry, evicted = table.get_at_index(slot), entry
+            table.set_at_index(slot, evicted)
+            number = 1 - number
+            if self._store_free(number, entry):
+                return None
+        return entry
+
+    def put(self, key: str, value: object) -> None:
+        """
+        -Updates the key/value pair in hash map. If given key already exists, its associated value must be replaced
+        with the new value. If given key does not exist, a key/value pair must be added.
+            - if one more entry would push the load factor past max_load, double the table first
+            - if max_kicks moves leave an entry without a slot, it goes to the stash; once the stash holds more
+                than 8 entries the table is rehashed (see _rehash())
+
+        Parameters:
+            self(HashMap)
+            key(str): the identifier
+            value(object): the identifier's value
+
+        Returns:
+            None
+        """
+        if (self._size + 1) / self._capacity > self._max_load:
+            self.resize_table(self._capacity * 2)
+
+        hash_val, hash2 = self._hash_function(key), self._function2(key)
+        location = self._locate(key, hash_val, hash2)
+        # key already exists --> update value
+        if location is not None:
+            self._entry_at(location).value = value
+            return
+
+        entry = HashEntry(key, value, hash_val)
+        entry.hash2 = hash2
+        self._size += 1
+        homeless = self._insert(entry)
+        if homeless is None:
+            return
+
+        self._stash.append(homeless)
+        if self._stash.length() > _STASH_LIMIT:
+            self._rehash()
+
+    def _rehash(self) -> None:
+        """
+        -Helper for put() once the stash holds more than 8 entries.
+            - the table is doubled until the stash fits, as long as it is at least a quarter full
+            - if that is not enough, one of the functions cannot separate the stashed keys: the one giving them
+                fewer distinct hashes is replaced by a SipHash with repeatable keys (each function at most
+                once), and every entry is placed again at the same capacity
+            - entries that still find no slot stay in the stash --> lookups stay correct but scan it; watch
+                get_stash_size() and pick better hash functions
+
+        Parameters:
+            self(HashMap)
+
+        Returns:
+            None
+        """
+        while self._stash.length() > _STASH_LIMIT and self.table_load() >= 0.25:
+            self.resize_table(self._capacity * 2)
+        if self._stash.length() <= _STASH_LIMIT or self._replaced == [True, True]:
+            return
+
+        # the function that lumps the stashed keys together is the one to replace
+        stash = [self._stash.get_at_index(i) for i in range(self._stash.length())]
+        number = 1
+        if not self._replaced[0] and \
+                (self._replaced[1] or len({e.hash for e in stash}) < len({e.hash2 for e in stash})):
+            number = 0
+        self._replaced[number] = True
+        function = make_siphash(self._random.getrandbits(64), self._random.getrandbits(64))
+        if number == 0:
+            self._hash_function = function
+        else:
+            self._function2 = function
+
+        for table in self._tables + (self._stash,):
+            for each in range(table.length()):
+                entry = table.get_at_index(each)
+                if entry is None:
+                    continue
+                if number == 0:
+                    entry.hash = function(entry.key)
+                else:
+                    entry.hash2 = function(entry.key)
+        self.resize_table(self._capacity)
+
+    def table_load(self) -> float:
+        """
+        -Returns the current hash table's load factor.
+                load factor = # of total elements in table / # of slots
+        Parameters:
+            self(HashMap)
+
+        Returns:
+            float: load factor for hash table
+        """
+        return self._size / self._capacity
+
+    def empty_buckets(self) -> int:
+        """
+        Returns the number of empty slots (entries in the stash take up none)
+        Parameters:
+            self(HashMap)
+
+        Returns:
+            int: number of empty slots
+        """
+        return self._capacity - self._size + self._stash.length()
+
+    def resize_table(self, new_capacity: int) -> None:
+        """
+        -Changes the capacity of the internal hash table (rounded up to whole buckets). All existing key/value
+        pairs remain and are placed into the new tables using their cached hashes; the stash is emptied into
+        them too, and only entries that still find no slot go back to it. If new capacity is < 1 or < size
+        --> do nothing
+
+        Parameters:
+            self(HashMap)
+            new_capacity(int): new internal capacity
+
+        Returns:
+            None
+        """
+        if new_capacity < 1 or new_capacity < self._size:
+            return
+
+        old_tables, old_stash = self._tables, self._stash
+        self._allocate(new_capacity)
+
+        for table in old_tables + (old_stash,):
+            for each in range(table.length()):
+                entry = table.get_at_index(each)
+                if entry is not None:
+                    homeless = self._insert(entry)
+                    if homeless is not None:
+                        self._stash.append(homeless)
+
+    def get(self, key: str) -> object:
+        """
+        Returns value associated w/ given key. If key DNE --> return None
+
+        Parameters:
+            self(HashMap)
+            key(str): key we are searching for
+
+        Returns:
+            object: value of searched key --> return None if DNE
+        """
+        location = self._locate(key, self._hash_function(key))
+        if location is None:
+            return None
+        return self._entry_at(location).value
+
+    def contains_key(self, key: str) -> bool:
+        """
+        Returns a boolean based on whether desired key is in HashMap.
+
+        Parameters:
+            self(HashMap)
+            key(str): key we are searching for
+
+        Returns:
+            bool:
+                Exist --> True
+                DNE --> False
+        """
+        if self._size == 0:
+            return False
+        return self._locate(key, self._hash_function(key)) is not None
+
+    def remove(self, key: str) -> None:
+        """
+        Removes given key and its associated value from HashMap --> its slot simply becomes empty, since no
+        other key's lookup ever passes through it
+
+        Parameters:
+            self(HashMap)
+            key(str): key we are removing
+
+        Returns:
+            None
+        """
+        location = self._locate(key, self._hash_function(key))
+        if location is None:
+            return
+
+        if location[0] == 2:
+            # order of the stash does not matter --> move the last entry into the gap
+            self._stash.swap(location[1], self._stash.length() - 1)
+            self._stash.pop()
+        else:
+            self._tables[location[0]].set_at_index(location[1], None)
+        self._size -= 1
+
+    def clear(self) -> None:
+        """
+        Clears contents of HashMap. Do not touch underlying hash table capacity.
+
+        Parameters:
+            self(HashMap)
+
+        Returns:
+            None
+        """
+        self._allocate(self._capacity)
+        self._size = 0
+
+    def get_keys(self) -> DynamicArray:
+        """
+        Returns a DynamicArray that contains all keys stored in the Hash Map. Order does not matter.
+
+        Parameters:
+            self(HashMap)
+
+        Returns:
+            da(DynamicArray): contains all valid keys in any order
+        """
+        da = DynamicArray()
+        for table in self._tables + (self._stash,):
+            for each in range(table.length()):
+                if table.get_at_index(each) is not None:
+                    da.append(table.get_at_index(each).key)
+        return da
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+
+if __name__ == "__main__":
+
+    print("\nPDF - put example 1")
+    print("-------------------")
+    m = HashMap(50, hash_function_1)
+    for i in range(150):
+        m.put('str' + str(i), i * 100)
+        if i % 25 == 24:
+            print(m.empty_buckets(), m.table_load(), m.get_size(), m.get_capacity())
+
+    print("\nPDF - put example 2")
+    print("-------------------")
+    m = HashMap(40, hash_function_2)
+    for i in range(50):
+        m.put('str' + str(i // 3), i * 100)
+        if i % 10 == 9:
+            print(m.empty_buckets(), m.table_load(), m.get_size(), m.get_capacity())
+
+    print("\nPDF - resize example 2")
+    print("----------------------")
+    m = HashMap(75, hash_function_2)
+    keys = [i for i in range(1, 1000, 13)]
+    for key in keys:
+        m.put(str(key), key * 42)
+    print(m.get_size(), m.get_capacity())
+
+    for capacity in range(111, 1000, 117):
+        m.resize_table(capacity)
+
+        m.put('some key', 'some value')
+        result = m.contains_key('some key')
+        m.remove('some key')
+
+        for key in keys:
+            # all inserted keys must be present
+            result &= m.contains_key(str(key))
+            # NOT inserted keys must be absent
+            result &= not m.contains_key(str(key + 1))
+        print(capacity, result, m.get_size(), m.get_capacity(), round(m.table_load(), 2))
+
+    print("\nPDF - remove example 1")
+    print("----------------------")
+    m = HashMap(50, hash_function_1)
+    print(m.get('key1'))
+    m.put('key1', 10)
+    print(m.get('key1'))
+    m.remove('key1')
+    print(m.get('key1'))
+    m.remove('key4')
+
+    print("\nPDF - get_keys example 1")
+    print("------------------------")
+    m = HashMap(10, hash_function_2)
+    for i in range(100, 200, 10):
+        m.put(str(i), str(i * 10))
+    print(m.get_keys())
+
+    m.resize_table(1)
+    print(m.get_keys())
+
+    m.put('200', '2000')
+    m.remove('100')
+    m.resize_table(2)
+    print(m.get_keys())
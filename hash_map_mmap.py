@@ -0,0 +1,586 @@
+# Name: Eugene Song
+# OSU Email: songeu@oregonstate.edu
+# Course: CS261 - Data Structures
+# Description: An Open Addressing HashMap with Quadratic Probing that lives in a file and is read through mmap.
+#                   The file holds a header, a fixed-size slot array (state, hash, key offset, value offset)
+#                       and a heap of key/value records, so get/contains_key read straight from the page cache
+#                           and every process opening the same file shares one copy of it.
+
+import mmap
+import os
+import pickle
+import struct
+
+from a6_include import (DynamicArray,
+                        hash_function_1, hash_function_2)
+
+# ------------------------------ FILE FORMAT ------------------------------ #
+#   header   magic, format version, capacity, size, tombstones, slot array offset, heap end, hash function name
+#   slots    capacity x (state, hash, key offset, value offset) --> 32 bytes each, all zero means empty
+#   heap     key records (length, utf-8 bytes) and value records (type tag, length, payload), append only
+#
+# put/remove update slots in place and append new records to the heap. resize_table writes a new slot array
+# at the end of the heap and points the header at it, so the records themselves are never moved.
+# The header is rewritten on every mutation, and heap end is stored before any slot points past the old one,
+# so a process that dies without close() never leaves a live record beyond the stored heap end.
+
+_MAGIC = b'HMOAMMAP'
+_FORMAT_VERSION = 1
+_HEADER = struct.Struct('<8sIIQQQQQ32s')
+_SLOT = struct.Struct('<B7xQQQ')
+_LENGTH = struct.Struct('<I')
+_VALUE_HEAD = struct.Struct('<BI')
+_MASK64 = 0xFFFFFFFFFFFFFFFF
+
+# slot states
+_EMPTY = 0
+_LIVE = 1
+_TOMBSTONE = 2
+
+# value record type tags
+_NONE = 0
+_STR = 1
+_BYTES = 2
+_INT = 3
+_FLOAT = 4
+_PICKLE = 5
+
+
+def _encode_value(value: object) -> bytes:
+    """
+    -Returns the heap record of value: type tag, payload length, payload. Anything that is not
+    None/str/bytes/int/float is pickled.
+
+    Parameters:
+        value(object): value to encode
+
+    Returns:
+        bytes: value record
+    """
+    if value is None:
+        tag, payload = _NONE, b''
+    elif isinstance(value, str):
+        tag, payload = _STR, value.encode('utf-8')
+    elif isinstance(value, bytes):
+        tag, payload = _BYTES, value
+    elif type(value) is int and -2 ** 63 <= value < 2 ** 63:
+        tag, payload = _INT, struct.pack('<q', value)
+    elif type(value) is float:
+        tag, payload = _FLOAT, struct.pack('<d', value)
+    else:
+        tag, payload = _PICKLE, pickle.dumps(value)
+    return _VALUE_HEAD.pack(tag, len(payload)) + payload
+
+
+class HashMap:
+    def __init__(self, path: str, function, capacity: int = 11, mode: str = 'r') -> None:
+        """
+        Initialize HashMap stored in the file at path, using quadratic probing for collision resolution
+            - mode 'r' opens an existing file read-only (get/contains_key/get_keys only)
+            - mode 'r+' opens an existing file for reading and writing
+            - mode 'w' creates a new empty file of the given capacity, replacing any existing one
+            - function must give the same hash in every process (hash_function_1/2, hash_fnv1a, not
+                hash_siphash or hash_builtin); its name is stored in the file and checked on open
+            - a map opened with mode 'r' re-reads the header on every call, so it follows puts, removes and
+                resizes made through another handle (there is no locking: a read racing a write may miss it)
+        """
+        if mode not in ('r', 'r+', 'w'):
+            raise ValueError("mode must be 'r', 'r+' or 'w'")
+        if mode == 'w' and capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self._hash_function = function
+        self._writable = mode != 'r'
+        name = function.__name__.encode('ascii')[:32]
+
+        if mode == 'w':
+            with open(path, 'wb') as f:
+                f.write(_HEADER.pack(_MAGIC, _FORMAT_VERSION, 0, capacity, 0, 0, _HEADER.size,
+                                     _HEADER.size + capacity * _SLOT.size, name))
+                f.truncate(_HEADER.size + capacity * _SLOT.size)
+
+        self._file = open(path, 'r+b' if self._writable else 'rb')
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_WRITE if self._writable else mmap.ACCESS_READ)
+
+        magic, version, _, self._capacity, self._size, self._tombstones, self._slots, self._heap_end, stored = \
+            _HEADER.unpack_from(self._mm, 0)
+        if magic != _MAGIC or version != _FORMAT_VERSION:
+            self.close()
+            raise ValueError(path + " is not a HashMap table file")
+        if stored.rstrip(b'\0') != name:
+            self.close()
+            raise ValueError("table was written with hash function " + stored.rstrip(b'\0').decode('ascii'))
+
+    def __enter__(self) -> "HashMap":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __str__(self) -> str:
+        """
+        Override string method to provide more readable output
+        """
+        self._refresh()
+        out = ''
+        for i in range(self._capacity):
+            state, _, key_offset, value_offset = self._slot(i)
+            if state == _EMPTY:
+                out += str(i) + ': None\n'
+            else:
+                out += f"{i}: K: {self._key_at(key_offset)} V: {self._value_at(value_offset)} " \
+                       f"TS: {state == _TOMBSTONE}\n"
+        return out
+
+    def get_size(self) -> int:
+        """
+        Return size of map
+        """
+        self._refresh()
+        return self._size
+
+    def get_capacity(self) -> int:
+        """
+        Return capacity of map
+        """
+        self._refresh()
+        return self._capacity
+
+    def flush(self) -> None:
+        """
+        Write the header and every dirty page back to the file
+        """
+        if self._writable:
+            self._write_header()
+            self._mm.flush()
+
+    def close(self) -> None:
+        """
+        Flush (in a writable mode) and unmap the file. The map cannot be used afterwards.
+        """
+        if self._mm is not None:
+            self.flush()
+            self._mm.close()
+            self._file.close()
+            self._mm = None
+
+    # ------------------------------------------------------------------ #
+
+    def _write_header(self) -> None:
+        """
+        -Stores capacity, size, tombstones, slot array offset and heap end in the file header.
+
+        Parameters:
+            self(HashMap)
+
+        Returns:
+            None
+        """
+        magic, version, _, _, _, _, _, _, name = _HEADER.unpack_from(self._mm, 0)
+        _HEADER.pack_into(self._mm, 0, magic, version, 0, self._capacity, self._size, self._tombstones,
+                          self._slots, self._heap_end, name)
+
+    def _refresh(self) -> None:
+        """
+        -Read-only maps: reloads capacity, size, tombstones, slot array offset and heap end from the header, and
+        remaps the file once another handle has grown it past the current mapping. Writable maps own the
+        header, so they skip this.
+
+        Parameters:
+            self(HashMap)
+
+        Returns:
+            None
+        """
+        if self._writable:
+            return
+        _, _, _, self._capacity, self._size, self._tombstones, self._slots, self._heap_end, _ = \
+            _HEADER.unpack_from(self._mm, 0)
+        if self._heap_end > len(self._mm):
+            self._mm.close()
+            self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def _slot(self, index: int) -> tuple:
+        """
+        -Returns (state, hash, key offset, value offset) of slot index, read straight from the mapping.
+
+        Parameters:
+            self(HashMap)
+            index(int): slot index
+
+        Returns:
+            tuple: slot fields
+        """
+        return _SLOT.unpack_from(self._mm, self._slots + index * _SLOT.size)
+
+    def _key_at(self, offset: int) -> str:
+        """
+        -Decodes the key record at heap offset.
+
+        Parameters:
+            self(HashMap)
+            offset(int): file offset of the key record
+
+        Returns:
+            str: key
+        """
+        length = _LENGTH.unpack_from(self._mm, offset)[0]
+        return self._mm[offset + _LENGTH.size:offset + _LENGTH.size + length].decode('utf-8')
+
+    def _value_at(self, offset: int) -> object:
+        """
+        -Decodes the value record at heap offset.
+
+        Parameters:
+            self(HashMap)
+            offset(int): file offset of the value record
+
+        Returns:
+            object: value
+        """
+        tag, length = _VALUE_HEAD.unpack_from(self._mm, offset)
+        start = offset + _VALUE_HEAD.size
+        if tag == _NONE:
+            return None
+        if tag == _STR:
+            return self._mm[start:start + length].decode('utf-8')
+        if tag == _BYTES:
+            return self._mm[start:start + length]
+        if tag == _INT:
+            return struct.unpack_from('<q', self._mm, start)[0]
+        if tag == _FLOAT:
+            return struct.unpack_from('<d', self._mm, start)[0]
+        return pickle.loads(self._mm[start:start + length])
+
+    def _key_matches(self, offset: int, key_bytes: bytes) -> bool:
+        """
+        -Compares the key record at heap offset with key_bytes without decoding it.
+
+        Parameters:
+            self(HashMap)
+            offset(int): file offset of the key record
+            key_bytes(bytes): utf-8 encoded key
+
+        Returns:
+            bool: True if the record holds key_bytes
+        """
+        start = offset + _LENGTH.size
+        return _LENGTH.unpack_from(self._mm, offset)[0] == len(key_bytes) and \
+            self._mm[start:start + len(key_bytes)] == key_bytes
+
+    def _append(self, record: bytes) -> int:
+        """
+        -Appends record to the heap, growing the file (by doubling) when it is full.
+            - the new heap end is written to the header before the caller points a slot at the record
+
+        Parameters:
+            self(HashMap)
+            record(bytes): bytes to append
+
+        Returns:
+            int: file offset of record
+        """
+        offset = self._heap_end
+        needed = offset + len(record)
+        if needed > len(self._mm):
+            self._mm.resize(max(needed, 2 * len(self._mm)))
+        self._mm[offset:needed] = record
+        self._heap_end = needed
+        self._write_header()
+        return offset
+
+    def _find(self, key_bytes: bytes, hash_val: int) -> int:
+        """
+        -Walks the quadratic probe sequence of key and returns its live slot index.
+            - the probe sequence repeats after capacity steps, so the walk is bounded by capacity
+
+        Parameters:
+            self(HashMap)
+            key_bytes(bytes): utf-8 encoded key
+            hash_val(int): 64-bit hash of key
+
+        Returns:
+            int: slot index of key --> return -1 if DNE
+        """
+        self._refresh()
+        capacity = self._capacity
+        index = hash_val % capacity
+        for move_by in range(capacity):
+            probe = (index + move_by * move_by) % capacity
+            state, slot_hash, key_offset, _ = self._slot(probe)
+            if state == _EMPTY:
+                return -1
+            if state == _LIVE and slot_hash == hash_val and self._key_matches(key_offset, key_bytes):
+                return probe
+        return -1
+
+    def _place(self, key_offset: int, value_offset: int, hash_val: int) -> bool:
+        """
+        -Writes a live slot for a key known to be absent into the first empty or tombstone slot
+        of its probe sequence.
+
+        Parameters:
+            self(HashMap)
+            key_offset(int): file offset of the key record
+            value_offset(int): file offset of the value record
+            hash_val(int): 64-bit hash of key
+
+        Returns:
+            bool: False if the probe sequence had no free slot, True otherwise
+        """
+        capacity = self._capacity
+        index = hash_val % capacity
+        for move_by in range(capacity):
+            probe = (index + move_by * move_by) % capacity
+            state = self._slot(probe)[0]
+            if state != _LIVE:
+                if state == _TOMBSTONE:
+                    self._tombstones -= 1
+                _SLOT.pack_into(self._mm, self._slots + probe * _SLOT.size, _LIVE, hash_val, key_offset,
+                                value_offset)
+                self._size += 1
+                return True
+        return False
+
+    def _check_writable(self) -> None:
+        """
+        -Raises if the map was opened read-only.
+
+        Parameters:
+            self(HashMap)
+
+        Returns:
+            None
+        """
+        if not self._writable:
+            raise PermissionError("HashMap table file was opened read-only")
+
+    def put(self, key: str, value: object) -> None:
+        """
+        -Updates the key/value pair in hash map. If given key already exists, its associated value must be replaced
+        with the new value. If given key does not exist, a key/value pair must be added.
+            - if the load factor is greater than or equal to 0.5, the table is doubled first
+            - tombstones pushing used slots to half the table are purged by a same-capacity resize
+            - a replaced value record stays in the heap as garbage; resize_table does not reclaim it
+
+        Parameters:
+            self(HashMap)
+            key(str): the identifier
+            value(object): the identifier's value
+
+        Returns:
+            None
+        """
+        self._check_writable()
+        if self.table_load() >= 0.5:
+            self.resize_table(self._capacity * 2)
+        elif (self._size + self._tombstones) / self._capacity >= 0.5:
+            self.resize_table(self._capacity)
+
+        key_bytes = key.encode('utf-8')
+        hash_val = self._hash_function(key) & _MASK64
+        value_offset = self._append(_encode_value(value))
+
+        index = self._find(key_bytes, hash_val)
+        if index != -1:
+            # key already exists --> point its slot at the new value record
+            slot_offset = self._slots + index * _SLOT.size
+            _SLOT.pack_into(self._mm, slot_offset, _LIVE, hash_val, self._slot(index)[2], value_offset)
+            return
+
+        key_offset = self._append(_LENGTH.pack(len(key_bytes)) + key_bytes)
+        # probe sequence exhausted without a free slot --> grow and try again
+        while not self._place(key_offset, value_offset, hash_val):
+            self.resize_table(self._capacity * 2)
+        self._write_header()
+
+    def table_load(self) -> float:
+        """
+        -Returns the current hash table's load factor.
+                load factor = # of total elements in table / # of buckets
+        Parameters:
+            self(HashMap)
+
+        Returns:
+            float: load factor for hash table
+        """
+        self._refresh()
+        return self._size / self._capacity
+
+    def empty_buckets(self) -> int:
+        """
+        Returns the number of empty buckets.
+            algorithm: # of total buckets - # of elements - # of tombstones
+        Parameters:
+            self(HashMap)
+
+        Returns:
+            int: number of empty buckets
+        """
+        self._refresh()
+        return self._capacity - self._size - self._tombstones
+
+    def resize_table(self, new_capacity: int) -> None:
+        """
+        -Changes the capacity of the table. A new slot array is appended to the heap and filled from the cached
+        hashes of the live slots (no rehashing, no records moved); the header then points at it and the old
+        array is left behind as garbage. If new capacity is < 1 or < size --> do nothing
+
+        Parameters:
+            self(HashMap)
+            new_capacity(int): new internal capacity
+
+        Returns:
+            None
+        """
+        self._check_writable()
+        if new_capacity < 1 or new_capacity < self._size:
+            return
+
+        old_slots, old_capacity = self._slots, self._capacity
+        self._slots = self._append(bytes(new_capacity * _SLOT.size))
+        self._capacity = new_capacity
+        self._size = 0
+        self._tombstones = 0
+
+        for each in range(old_capacity):
+            state, hash_val, key_offset, value_offset = _SLOT.unpack_from(self._mm, old_slots + each * _SLOT.size)
+            if state == _LIVE and not self._place(key_offset, value_offset, hash_val):
+                # quadratic probing could not reach a free slot --> retry one size up from the old array
+                self._slots, self._capacity = old_slots, old_capacity
+                self._size = sum(1 for i in range(old_capacity) if self._slot(i)[0] == _LIVE)
+                self._tombstones = sum(1 for i in range(old_capacity) if self._slot(i)[0] == _TOMBSTONE)
+                self.resize_table(new_capacity + 1)
+                return
+        self._write_header()
+
+    def get(self, key: str) -> object:
+        """
+        Returns value associated w/ given key. If key DNE --> return None
+
+        Parameters:
+            self(HashMap)
+            key(str): key we are searching for
+
+        Returns:
+            object: value of searched key --> return None if DNE
+        """
+        index = self._find(key.encode('utf-8'), self._hash_function(key) & _MASK64)
+        if index == -1:
+            return None
+        return self._value_at(self._slot(index)[3])
+
+    def contains_key(self, key: str) -> bool:
+        """
+        Returns a boolean based on whether desired key is in HashMap.
+
+        Parameters:
+            self(HashMap)
+            key(str): key we are searching for
+
+        Returns:
+            bool:
+                Exist --> True
+                DNE --> False
+        """
+        return self._find(key.encode('utf-8'), self._hash_function(key) & _MASK64) != -1
+
+    def remove(self, key: str) -> None:
+        """
+        Removes given key and its associated value from HashMap --> "remove" by marking its slot as a tombstone
+
+        Parameters:
+            self(HashMap)
+            key(str): key we are removing
+
+        Returns:
+            None
+        """
+        self._check_writable()
+        index = self._find(key.encode('utf-8'), self._hash_function(key) & _MASK64)
+        if index == -1:
+            return
+
+        self._mm[self._slots + index * _SLOT.size] = _TOMBSTONE
+        self._tombstones += 1
+        self._size -= 1
+        self._write_header()
+
+    def clear(self) -> None:
+        """
+        Clears contents of HashMap and drops the heap. Do not touch underlying hash table capacity.
+
+        Parameters:
+            self(HashMap)
+
+        Returns:
+            None
+        """
+        self._check_writable()
+        self._slots = _HEADER.size
+        self._heap_end = _HEADER.size + self._capacity * _SLOT.size
+        self._mm.resize(self._heap_end)
+        self._mm[self._slots:self._heap_end] = bytes(self._capacity * _SLOT.size)
+        self._size = 0
+        self._tombstones = 0
+        self._write_header()
+
+    def get_keys(self) -> DynamicArray:
+        """
+        Returns a DynamicArray that contains all keys stored in the Hash Map. Order does not matter.
+
+        Parameters:
+            self(HashMap)
+
+        Returns:
+            da(DynamicArray): contains all valid keys in any order
+        """
+        self._refresh()
+        da = DynamicArray()
+        for each in range(self._capacity):
+            state, _, key_offset, _ = self._slot(each)
+            if state == _LIVE:
+                da.append(self._key_at(key_offset))
+        return da
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+
+if __name__ == "__main__":
+
+    import tempfile
+
+    path = os.path.join(tempfile.mkdtemp(), 'table.hmap')
+
+    print("\nPDF - put example 1 (written to a file)")
+    print("---------------------------------------")
+    with HashMap(path, hash_function_1, 50, mode='w') as m:
+        for i in range(150):
+            m.put('str' + str(i), i * 100)
+            if i % 25 == 24:
+                print(m.empty_buckets(), m.table_load(), m.get_size(), m.get_capacity())
+
+    print("\nreopened read-only")
+    print("------------------")
+    with HashMap(path, hash_function_1) as m:
+        print(m.get_size(), m.get('str7'), m.contains_key('str149'), m.contains_key('str150'))
+        try:
+            m.put('str7', 0)
+        except PermissionError as error:
+            print(error)
+
+    print("\nreopened read-write")
+    print("-------------------")
+    with HashMap(path, hash_function_1, mode='r+') as m:
+        m.put('str7', 'seven')
+        m.put('tuple', (1, 2.5, None))
+        m.remove('str8')
+        print(m.get_size(), m.get('str7'), m.get('tuple'), m.get('str8'))
+
+    with HashMap(path, hash_function_1) as m:
+        print(m.get_size(), m.get('str7'), m.get('tuple'), m.get('str8'), m.get_keys().length())
+
+    try:
+        HashMap(path, hash_function_2)
+    except ValueError as error:
+        print(error)
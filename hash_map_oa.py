@@ -6,17 +6,34 @@
 # Description: A HashMap will be implemented using a Dynamic Array to store the hash table and implement Open
 #                   Addressing with Quadratic Probing for collision resolution inside the Dynamic Array.
 
+import threading
+import time
+from contextlib import contextmanager
 
-from a6_include import (DynamicArray, HashEntry,
+from a6_include import (DynamicArray, HashEntry, ProbeStats,
                         hash_function_1, hash_function_2)
+from bloom_filter import BloomFilter
+from bulk_hash import as_batch, hash_all, bucket_order
+from map_dump import DumpWriter, read_dump
 
 
 class HashMap:
-    def __init__(self, capacity: int, function) -> None:
+    def __init__(self, capacity: int, function, migrate_step: int = 0, tombstone_limit: float = 0.25,
+                 stats: bool = False, sweep_step: int = 0, clock=time.monotonic, bloom_bits: int = 0) -> None:
         """
         Initialize new HashMap that uses
         quadratic probing for collision resolution
-        DO NOT CHANGE THIS METHOD IN ANY WAY
+            - migrate_step > 0 turns on incremental resizing: a doubling keeps the old table alongside the
+                new one and moves migrate_step old buckets across on every put/get/contains_key/remove
+            - once tombstones fill tombstone_limit of the buckets, put() purges them by rehashing
+                at the same capacity. 0 or None turns this early purge off; tombstones are then only purged
+                once they and the entries together fill half the buckets
+            - stats=True records the buckets probed by every put/get/remove (see get_stats())
+            - entries put with a ttl expire after ttl seconds of clock(); sweep_step > 0 makes every
+                put/get/contains_key/remove also sweep that many buckets for expired entries (see sweep())
+            - bloom_bits > 0 keeps a Bloom filter of bloom_bits bits per bucket next to the table, so
+                get/contains_key/get_many of a key it rules out return without probing. resize_table() and
+                clear() rebuild it; until then removed keys keep their bits
         """
         self._buckets = DynamicArray()
         for _ in range(capacity):
@@ -26,6 +43,33 @@ class HashMap:
         self._hash_function = function
         self._size = 0
 
+        # tombstones currently sitting in _buckets
+        self._tombstones = 0
+        self._tombstone_limit = tombstone_limit
+
+        # opt-in instrumentation --> _probes counts buckets probed by the operation in progress
+        #       (only touched while stats are on, so a disabled map never writes it)
+        self._stats = ProbeStats() if stats else None
+        self._probes = 0
+
+        # bumped by every put/remove/clear/resize so live iterators can tell the map changed under them
+        self._version = 0
+
+        # incremental resize state --> _old_buckets is None unless a migration is running
+        self._migrate_step = migrate_step
+        self._old_buckets = None
+        self._migrate_index = 0
+
+        # expiry --> _sweep_index is the next bucket sweep() looks at
+        self._sweep_step = sweep_step
+        self._sweep_index = 0
+        self._clock = clock
+
+        # negative lookup filter --> _old_bloom covers _old_buckets while a migration is running
+        self._bloom_bits = bloom_bits
+        self._bloom = self._new_bloom(capacity)
+        self._old_bloom = None
+
     def __str__(self) -> str:
         """
         Override string method to provide more readable output
@@ -50,46 +94,145 @@ class HashMap:
         """
         return self._capacity
 
+    def get_tombstones(self) -> int:
+        """
+        Return number of tombstones in the current buckets
+        """
+        return self._tombstones
+
+    def get_stats(self) -> ProbeStats:
+        """
+        Return probe counters of the map, or None if it was created without stats=True
+        """
+        return self._stats
+
     # ------------------------------------------------------------------ #
 
-    def put(self, key: str, value: object) -> None:
+    def put(self, key: str, value: object, ttl: float = None) -> None:
         """
         -Updates the key/value pair in hash map. If given key already exists, its associated value must be replaced
         with the new value. If given key does not exist, a key/value pair must be added.
             - remember, if the load factor is greater than or equal to 0.5,
                     resize the table before putting the new key/value pair
+            - with a ttl the entry is treated as absent once ttl seconds have passed; without one it never
+                expires (a ttl set by an earlier put is dropped). An expired entry counts towards get_size()
+                until a probe or sweep() turns it into a tombstone
 
         Parameters:
             self(HashMap)
             key(str): the identifier
             value(object): the identifier's value
+            ttl(float): seconds until the entry expires --> None for no expiry
 
         Returns:
             None
         """
+        # --------------------- 1st step of Hash Function Computation --> find hash ---------------------------
+        self._put_hashed(key, value, self._hash_function(key), None if ttl is None else self._clock() + ttl)
+
+    def _put_hashed(self, key: str, value: object, hash_val: int, expires: float = None) -> None:
+        """
+        -Helper for put() and resize_table() that places the key/value pair using an already computed full hash,
+        so entries moved by a resize are never rehashed. The hash is cached in the HashEntry and compared
+        before the key on every probe.
+
+        Parameters:
+            self(HashMap)
+            key(str): the identifier
+            value(object): the identifier's value
+            hash_val(int): full hash of key
+            expires(float): clock() time the entry expires at --> None for no expiry
+
+        Returns:
+            None
+        """
+        self._make_room(key, hash_val)
+        if self._stats is not None:
+            self._probes = 0
+        self._place(key, value, hash_val, expires)
+        if self._stats is not None:
+            self._stats.record('put', self._probes)
+
+    def _make_room(self, key: str, hash_val: int) -> HashEntry:
+        """
+        -Helper for _put_hashed() and _add_count() that runs the work due before a key is placed: the sweep
+        step, the load factor / tombstone checks, and one step of any running migration.
+
+        Parameters:
+            self(HashMap)
+            key(str): key about to be placed
+            hash_val(int): full hash of key
+
+        Returns:
+            HashEntry: live copy of key evicted from the old table --> None if there was none
+        """
+        if self._sweep_step > 0:
+            self.sweep(self._sweep_step)
+
         # ------ PRE-PRECONDITION CHECK LOAD FACTOR BEFORE ANYTHING --> resize to optimize for future performance ---
+        new_capacity = None
         if self.table_load() >= 0.5:
-            self.resize_table(self.get_capacity() * 2)
-        # --------------------- 2-step Hash Function Computation --> find hash ---------------------------
-        hash_val = self._hash_function(key)
+            new_capacity = self.get_capacity() * 2
+        # ------ tombstones past the limit, or pushing used buckets past half --> purge at the same capacity ------
+        elif (self._tombstone_limit and self._tombstones >= self._tombstone_limit * self.get_capacity()) or \
+                (self.get_size() + self._tombstones) / self.get_capacity() >= 0.5:
+            new_capacity = self.get_capacity()
+
+        if new_capacity is not None:
+            if self._migrate_step > 0:
+                self._start_migration(new_capacity)
+            else:
+                self.resize_table(new_capacity)
+
+        # ------ incremental resize running --> move the next batch and drop any old copy of key ------
+        if self._old_buckets is not None:
+            self._migrate(self._migrate_step)
+            if self._old_buckets is not None:
+                return self._evict_old(key, hash_val)
+        return None
+
+    def _place(self, key: str, value: object, hash_val: int, expires: float = None) -> HashEntry:
+        """
+        -Places the key/value pair into the current buckets without checking the load factor.
+
+        Parameters:
+            self(HashMap)
+            key(str): the identifier
+            value(object): the identifier's value
+            hash_val(int): full hash of key
+            expires(float): clock() time the entry expires at --> None for no expiry
+
+        Returns:
+            HashEntry: entry now holding the pair
+        """
+        if self._bloom is not None:
+            self._bloom.add(hash_val)
+        self._version += 1
+        # --------------------- 2nd step of Hash Function Computation --> find index ---------------------------
         index = hash_val % self.get_capacity()  # <--- returns index in DynamicArray
         # -------------------------------------------------------------------------------
         # gets value at hashed index and init new hash entry (tombstone implemented)
         current_position = self._buckets.get_at_index(index)
-        new_hash_entry = HashEntry(key, value)
+        new_hash_entry = HashEntry(key, value, hash_val)
         # -------------------------------------------------------------------------------
         # corner case 1) if current position is None (empty) --> insert hash entry
+        entry = new_hash_entry
         if current_position is None:
             self._buckets.set_at_index(index, new_hash_entry)
             self._size += 1
         # corner case 2) if current position IS the key we want to insert --> update value
-        elif current_position.key == key and current_position.is_tombstone is False:
+        elif current_position.hash == hash_val and current_position.key == key and \
+                current_position.is_tombstone is False:
             current_position.value = value
+            entry = current_position
         # corner case 3) if current is a tombstone w/ the key --> update value and tombstone value
-        elif current_position.key == key and current_position.is_tombstone is True:
+        elif current_position.hash == hash_val and current_position.key == key and \
+                current_position.is_tombstone is True:
             current_position.value = value
             current_position.is_tombstone = False
+            self._tombstones -= 1
             self._size += 1
+            entry = current_position
         # else if spot is not empty AND spot has different key (already occupied) --> execute quadratic probing
         else:
             # init probing counter for use in probing formula
@@ -105,21 +248,121 @@ class HashMap:
                     self._size += 1
                     keepGoing = False
                 # if key already exists --> update HashEntry value
-                elif self._buckets.get_at_index(probe).key == key and \
+                elif self._buckets.get_at_index(probe).hash == hash_val and \
+                        self._buckets.get_at_index(probe).key == key and \
                         self._buckets.get_at_index(probe).is_tombstone is False:
                     self._buckets.get_at_index(probe).value = value
+                    entry = self._buckets.get_at_index(probe)
                     keepGoing = False
                     # if key exists but is a tombstone
-                elif self._buckets.get_at_index(probe).key == key and self._buckets.get_at_index(probe).is_tombstone \
-                        is True:
+                elif self._buckets.get_at_index(probe).hash == hash_val and \
+                        self._buckets.get_at_index(probe).key == key and \
+                        self._buckets.get_at_index(probe).is_tombstone is True:
                     self._buckets.get_at_index(probe).value = value
                     self._buckets.get_at_index(probe).is_tombstone = False
+                    self._tombstones -= 1
                     self._size += 1
+                    entry = self._buckets.get_at_index(probe)
                     keepGoing = False
                     # if slot is filled by a different key
                 else:
                     move_by += 1
-        return
+                    # probe sequence repeats after capacity steps without reaching a free slot
+                    #       (keys sharing one hash only ever see a fraction of the buckets) --> grow and retry
+                    if move_by >= self.get_capacity():
+                        self.resize_table(self.get_capacity() * 2)
+                        entry = self._place(key, value, hash_val, expires)
+                        keepGoing = False
+            # buckets probed past the home bucket
+            if self._stats is not None:
+                self._probes += move_by
+
+        # only touch expires when there is or was a ttl, so entries without one keep the class default
+        if expires is not None or entry.expires is not None:
+            entry.expires = expires
+        if self._stats is not None:
+            self._probes += 1
+        return entry
+
+    def _add_count(self, key: str, hash_val: int, delta: int) -> int:
+        """
+        -Helper that adds delta to the value of key, starting from 0 if key DNE, with a single walk of its
+        probe sequence: the walk stops at the live entry, the key's own tombstone, or the first empty slot.
+
+        Parameters:
+            self(HashMap)
+            key(str): the identifier
+            hash_val(int): full hash of key
+            delta(int): amount to add
+
+        Returns:
+            int: new value of key
+        """
+        evicted = self._make_room(key, hash_val)
+        if evicted is not None:
+            delta += evicted.value
+
+        if self._stats is not None:
+            self._probes = 0
+        value = self._bump(key, hash_val, delta)
+        if self._stats is not None:
+            self._stats.record('put', self._probes)
+        return value
+
+    def _bump(self, key: str, hash_val: int, delta: int) -> int:
+        """
+        -Helper for _add_count() that walks the probe sequence once, adding delta to the key's entry or
+        placing a new entry holding delta. An expired entry counts from 0 again.
+
+        Parameters:
+            self(HashMap)
+            key(str): the identifier
+            hash_val(int): full hash of key
+            delta(int): amount to add
+
+        Returns:
+            int: new value of key
+        """
+        if self._bloom is not None:
+            self._bloom.add(hash_val)
+        self._version += 1
+        capacity = self.get_capacity()
+        index = hash_val % capacity
+
+        for move_by in range(capacity):
+            probe = (index + move_by * move_by) % capacity
+            current = self._buckets.get_at_index(probe)
+            # empty slot ends the probe sequence --> key DNE, insert here
+            if current is None:
+                if self._stats is not None:
+                    self._probes += move_by + 1
+                self._buckets.set_at_index(probe, HashEntry(key, delta, hash_val))
+                self._size += 1
+                return delta
+            if current.hash == hash_val and current.key == key:
+                if self._stats is not None:
+                    self._probes += move_by + 1
+                # key's own tombstone --> revive it with delta (flag cleared last, so a lock-free reader
+                #       never sees the count from before the removal)
+                if current.is_tombstone:
+                    current.value = delta
+                    current.expires = None
+                    current.is_tombstone = False
+                    self._tombstones -= 1
+                    self._size += 1
+                # expired entry --> its old count is gone, start over from delta
+                elif current.expires is not None and self._is_expired(current, self._clock()):
+                    current.value = delta
+                    current.expires = None
+                else:
+                    current.value += delta
+                return current.value
+
+        # probe sequence repeats without reaching a free slot --> grow and retry
+        if self._stats is not None:
+            self._probes += capacity
+        self.resize_table(capacity * 2)
+        return self._bump(key, hash_val, delta)
 
     def table_load(self) -> float:
         """
@@ -142,19 +385,22 @@ class HashMap:
     def empty_buckets(self) -> int:
         """
         Returns the number of empty buckets.
-            algorithm: # of total buckets - # of elements
+            algorithm: # of total buckets - # of elements - # of tombstones
         Parameters:
             self(HashMap)
 
         Returns:
             int: number of empty buckets
         """
-        return self.get_capacity() - self.get_size()
+        return self.get_capacity() - self.get_size() - self._tombstones
 
     def resize_table(self, new_capacity: int) -> None:
         """
-        -Changes the capacity of the internal hash table. All existing key/value pairs must remain and be rehashed
-        into a new hash map. If new capacity is < 1 --> do nothing
+        -Changes the capacity of the internal hash table. All existing key/value pairs must remain and be placed
+        straight into new buckets using their cached hashes (no rehashing, no put() calls); tombstones are
+        dropped along the way. If new capacity is < 1 --> do nothing
+            - if the entries would push the new table to a load factor of 0.5, it is doubled up front,
+                just as put() would have done while refilling it
 
         Parameters:
             self(HashMap)
@@ -163,25 +409,60 @@ class HashMap:
         Returns:
             None
         """
+        # an incremental resize in progress is completed first so every entry lives in _buckets
+        if self._old_buckets is not None:
+            self._migrate(self._old_buckets.length())
+
         # corner case: when new capacity is less than 1 OR less than the current # of elements in map
         if new_capacity < 1 or new_capacity < self.get_size():
             return
 
-        # create a new HashMap with new capacity
-        new_map = HashMap(new_capacity, self._hash_function)
+        while (self.get_size() - 1) / new_capacity >= 0.5:
+            new_capacity *= 2
 
-        # iterate buckets (capacity)
-        for each in range(self._buckets.length()):
-            if self._buckets.get_at_index(each) is not None:
-                if self._buckets.get_at_index(each).is_tombstone is False:
-                    new_map.put(self._buckets.get_at_index(each).key, self._buckets.get_at_index(each).value)
+        # swap in empty buckets (and filter) of new capacity, then place every live entry straight into them
+        old_buckets = self._buckets
+        self._buckets = DynamicArray([None] * new_capacity)
+        self._bloom = self._new_bloom(new_capacity)
+        self._capacity = new_capacity
+        self._size = 0
+        self._tombstones = 0
+        self._version += 1
 
-        # set self._buckets to new map's buckets and reinitialize capacity to new map's capacity
-        self._buckets = new_map._buckets
-        self._capacity = new_map.get_capacity()
+        # iterate old buckets (capacity)
+        for each in range(old_buckets.length()):
+            entry = old_buckets.get_at_index(each)
+            if entry is not None and entry.is_tombstone is False:
+                self._place(entry.key, entry.value, entry.hash, entry.expires)
 
         return
 
+    @classmethod
+    def from_items(cls, iterable, function, expected_size: int = None, **options) -> "HashMap":
+        """
+        -Builds a HashMap from (key, value) pairs in one pass. The capacity is picked once so the load factor
+        stays under 0.5 for expected_size entries, and every pair is placed straight into the buckets,
+        bucket by bucket, with keys hashed up front. A key repeated in iterable keeps its last value.
+
+        Parameters:
+            iterable(iterable): (key, value) pairs
+            function: hash function of the new map
+            expected_size(int): number of entries to size for, if more than iterable holds
+            options: other HashMap constructor arguments (migrate_step, tombstone_limit, stats)
+
+        Returns:
+            HashMap: new map holding every pair
+        """
+        pairs = list(iterable)
+        expected = max(expected_size or 0, len(pairs))
+        hash_map = cls(2 * expected + 1, function, **options)
+
+        hashes = hash_all([key for key, _ in pairs], function)
+        capacity = hash_map.get_capacity()
+        for i in bucket_order(hashes, capacity):
+            hash_map._place(pairs[i][0], pairs[i][1], hashes[i])
+        return hash_map
+
     def get(self, key: str) -> object:
         """
         Returns value associated w/ given key. If key DNE --> return None
@@ -193,39 +474,13 @@ class HashMap:
         Returns:
             object: value of searched key --> return None if DNE
         """
+        # --------------------- 1st step of Hash Function Computation --> find hash ---------------------------
+        entry = self._lookup(key, self._hash_function(key))
 
-        # --------------------- 2-step Hash Function Computation --> find hash ---------------------------
-        hash_val = self._hash_function(key)
-        index = hash_val % self.get_capacity()  # <--- returns index in DynamicArray
-        # -------------------------------------------------------------------------------
-        # gets value at hashed index and init new hash entry (tombstone implemented)
-        current_position = self._buckets.get_at_index(index)
-
-        # init probing counter for use in probing formula
-        move_by = 1
-        keepGoing = True
-
-        # if current == None --> value DNE
-        if current_position is None:
+        # if entry == None --> value DNE
+        if entry is None:
             return None
-        # if found
-        elif current_position.is_tombstone is False and current_position.key == key:
-            return current_position.value
-        # if current is already taken by a different key
-        else:
-            # iterate through DA using perform quadratic probing and wrapping
-            while keepGoing:
-                probe = (index + move_by ** 2) % self.get_capacity()
-                # again, if empty --> DNE
-                if self._buckets.get_at_index(probe) is None:
-                    return None
-                # if key --> return val
-                elif self._buckets.get_at_index(probe).key == key and \
-                        self._buckets.get_at_index(probe).is_tombstone is False:
-                    return self._buckets.get_at_index(probe).value
-                # probe
-                else:
-                    move_by += 1
+        return entry.value
 
     def contains_key(self, key: str) -> bool:
         """
@@ -244,38 +499,8 @@ class HashMap:
         if self.get_size() == 0:
             return False
 
-        # --------------------- 2-step Hash Function Computation --> find hash ---------------------------
-        hash_val = self._hash_function(key)
-        index = hash_val % self.get_capacity()  # <--- returns index in DynamicArray
-        # -------------------------------------------------------------------------------
-        # gets value at hashed index and init new hash entry (tombstone implemented)
-        current_position = self._buckets.get_at_index(index)
-
-        # init probing counter for use in probing formula
-        move_by = 1
-        keepGoing = True
-
-        # if current == None --> value DNE --> False
-        if current_position is None:
-            return False
-        # if found --> return True
-        elif current_position.is_tombstone is False and current_position.key == key:
-            return True
-        # if current is already taken by a different key
-        else:
-            # iterate through DA using perform quadratic probing and wrapping
-            while keepGoing:
-                probe = (index + move_by ** 2) % self.get_capacity()
-                # again, if empty --> DNE --> False
-                if self._buckets.get_at_index(probe) is None:
-                    return False
-                # if key --> return True
-                elif self._buckets.get_at_index(probe).key == key and \
-                        self._buckets.get_at_index(probe).is_tombstone is False:
-                    return True
-                # probe
-                else:
-                    move_by += 1
+        # --------------------- 1st step of Hash Function Computation --> find hash ---------------------------
+        return self._lookup(key, self._hash_function(key)) is not None
 
     def remove(self, key: str) -> None:
         """
@@ -288,42 +513,270 @@ class HashMap:
         Returns:
             None
         """
-        # --------------------- 2-step Hash Function Computation --> find hash ---------------------------
-        hash_val = self._hash_function(key)
-        index = hash_val % self.get_capacity()  # <--- returns index in DynamicArray
-        # -------------------------------------------------------------------------------
-        # gets value at hashed index and init new hash entry (tombstone implemented)
-        current_position = self._buckets.get_at_index(index)
+        # --------------------- 1st step of Hash Function Computation --> find hash ---------------------------
+        self._remove_hashed(key, self._hash_function(key))
 
-        # init probing counter for use in probing formula
-        move_by = 1
-        keepGoing = True
+    def _remove_hashed(self, key: str, hash_val: int) -> None:
+        """
+        -Helper for remove() and remove_many() that removes key using an already computed full hash.
 
-        # if None --> return
-        if current_position is None:
-            return
-        # if immediately found --> make tombstone and dec size
-        elif current_position.is_tombstone is False and current_position.key == key:
-            current_position.is_tombstone = True
+        Parameters:
+            self(HashMap)
+            key(str): key we are removing
+            hash_val(int): full hash of key
+
+        Returns:
+            None
+        """
+        if self._sweep_step > 0:
+            self.sweep(self._sweep_step)
+        if self._old_buckets is not None:
+            self._migrate(self._migrate_step)
+
+        # if found in the current buckets --> make tombstone, count it and dec size
+        if self._stats is not None:
+            self._probes = 0
+        entry = self._find_entry(self._buckets, key, hash_val)
+        if entry is not None:
+            entry.is_tombstone = True
+            self._tombstones += 1
             self._size -= 1
-            return
-        # if current is already taken by a different key
-        else:
-            # iterate through DA using perform quadratic probing and wrapping
-            while keepGoing:
-                probe = (index + move_by ** 2) % self.get_capacity()
-                # if key --> return val
-                if self._buckets.get_at_index(probe) is None:
-                    return
-                elif self._buckets.get_at_index(probe).key == key and \
-                        self._buckets.get_at_index(probe).is_tombstone is False:
-                    self._buckets.get_at_index(probe).is_tombstone = True
-                    self._size -= 1
-                # probe
-                else:
-                    move_by += 1
+            self._version += 1
+        # during an incremental resize the key may still wait in the old table (its tombstones go with it)
+        elif self._old_buckets is not None:
+            self._evict_old(key, hash_val)
+
+        if self._stats is not None:
+            self._stats.record('remove', self._probes)
         return
 
+    def _lookup(self, key: str, hash_val: int) -> HashEntry:
+        """
+        -Helper for get(), contains_key() and get_many() that returns the live HashEntry for key.
+            - while an incremental resize is running, first moves the next batch of buckets across, then
+                searches the new table and falls back to the old one
+
+        Parameters:
+            self(HashMap)
+            key(str): key we are searching for
+            hash_val(int): full hash of key
+
+        Returns:
+            HashEntry: live entry for key --> return None if DNE
+        """
+        if self._sweep_step > 0:
+            self.sweep(self._sweep_step)
+        if self._old_buckets is not None:
+            self._migrate(self._migrate_step)
+
+        if self._stats is not None:
+            self._probes = 0
+        entry = None
+        # filter rules the key out --> DNE without probing either table
+        if self._may_contain(hash_val):
+            entry = self._find_entry(self._buckets, key, hash_val)
+            if entry is None and self._old_buckets is not None:
+                entry = self._find_entry(self._old_buckets, key, hash_val)
+
+        if self._stats is not None:
+            self._stats.record('get', self._probes)
+        return entry
+
+    def _new_bloom(self, capacity: int) -> BloomFilter:
+        """
+        -Returns an empty Bloom filter sized for a table of capacity buckets --> None if the filter is off.
+
+        Parameters:
+            self(HashMap)
+            capacity(int): capacity of the table the filter covers
+
+        Returns:
+            BloomFilter: empty filter of bloom_bits bits per bucket
+        """
+        if self._bloom_bits <= 0:
+            return None
+        return BloomFilter(capacity * self._bloom_bits)
+
+    def _may_contain(self, hash_val: int) -> bool:
+        """
+        -Checks the Bloom filter(s) for a full hash.
+
+        Parameters:
+            self(HashMap)
+            hash_val(int): full hash of key
+
+        Returns:
+            bool: False if the key is certainly absent --> True if it may be present (or there is no filter)
+        """
+        if self._bloom is None or self._bloom.might_contain(hash_val):
+            return True
+        return self._old_bloom is not None and self._old_bloom.might_contain(hash_val)
+
+    def _find_entry(self, buckets: DynamicArray, key: str, hash_val: int) -> HashEntry:
+        """
+        -Helper that walks the quadratic probe sequence of key in the given bucket array.
+            - the probe sequence repeats after capacity steps, so the walk stops there even if no slot is None
+            - adds the number of buckets probed to self._probes (only while stats are on)
+            - expired entries met along the way are reclaimed (see _expire()) and probed past like tombstones
+
+        Parameters:
+            self(HashMap)
+            buckets(DynamicArray): bucket array to search
+            key(str): key we are searching for
+            hash_val(int): full hash of key
+
+        Returns:
+            HashEntry: live entry for key --> return None if DNE
+        """
+        capacity = buckets.length()
+        # --------------------- 2nd step of Hash Function Computation --> find index ---------------------------
+        index = hash_val % capacity
+
+        # iterate through DA using quadratic probing and wrapping
+        for move_by in range(capacity):
+            current_position = buckets.get_at_index((index + move_by ** 2) % capacity)
+            # if empty --> DNE
+            if current_position is None:
+                if self._stats is not None:
+                    self._probes += move_by + 1
+                return None
+            if current_position.expires is not None and current_position.is_tombstone is False and \
+                    self._expire(buckets, current_position):
+                continue
+            # if found (cached hash compared before the key)
+            if current_position.is_tombstone is False and current_position.hash == hash_val and \
+                    current_position.key == key:
+                if self._stats is not None:
+                    self._probes += move_by + 1
+                return current_position
+        if self._stats is not None:
+            self._probes += capacity
+        return None
+
+    def _expire(self, buckets: DynamicArray, entry: HashEntry) -> bool:
+        """
+        -If the live entry has expired, turns it into a tombstone --> the same tombstone a remove() leaves,
+        so purging and reuse of the slot work unchanged.
+            - not counted as a change by live iterators (_version): they already skip expired entries, so a
+                get() or contains_key() reclaiming one mid-iteration changes nothing they can see
+
+        Parameters:
+            self(HashMap)
+            buckets(DynamicArray): bucket array holding entry (current or old table)
+            entry(HashEntry): live entry with an expiry time
+
+        Returns:
+            bool: True if entry has expired
+        """
+        if entry.expires > self._clock():
+            return False
+        entry.is_tombstone = True
+        self._size -= 1
+        if buckets is self._buckets:
+            self._tombstones += 1
+        return True
+
+    def sweep(self, count: int) -> int:
+        """
+        -Incremental expiry: looks at the next count buckets (wrapping around the table) and reclaims every
+        expired entry among them. Call it from a timer, or set sweep_step to run it on every operation.
+
+        Parameters:
+            self(HashMap)
+            count(int): number of buckets to look at
+
+        Returns:
+            int: number of entries reclaimed
+        """
+        capacity = self.get_capacity()
+        index = self._sweep_index % capacity
+        reclaimed = 0
+        for _ in range(min(count, capacity)):
+            entry = self._buckets.get_at_index(index)
+            if entry is not None and entry.expires is not None and entry.is_tombstone is False and \
+                    self._expire(self._buckets, entry):
+                reclaimed += 1
+            index = (index + 1) % capacity
+        self._sweep_index = index
+        return reclaimed
+
+    def _start_migration(self, new_capacity: int) -> None:
+        """
+        -Begins an incremental resize: the current buckets become the old table and an empty table of
+        new_capacity takes their place. Entries are moved across later by _migrate().
+
+        Parameters:
+            self(HashMap)
+            new_capacity(int): capacity of the new table
+
+        Returns:
+            None
+        """
+        # an earlier migration must be finished before the old table can be replaced
+        if self._old_buckets is not None:
+            self._migrate(self._old_buckets.length())
+
+        self._old_buckets = self._buckets
+        self._migrate_index = 0
+        self._version += 1
+        self._tombstones = 0
+
+        # built from a ready-made list so starting the migration stays cheap
+        self._buckets = DynamicArray([None] * new_capacity)
+        self._capacity = new_capacity
+
+        # the old filter keeps covering the old table; entries moved or put from now on go into the new one
+        self._old_bloom = self._bloom
+        self._bloom = self._new_bloom(new_capacity)
+
+    def _migrate(self, count: int) -> None:
+        """
+        -Moves up to count buckets from the old table into the new one, using cached hashes.
+            - a moved entry is left behind as a tombstone so probe sequences of the old table stay intact
+            - the old table is dropped once every bucket has been moved
+
+        Parameters:
+            self(HashMap)
+            count(int): number of old buckets to move
+
+        Returns:
+            None
+        """
+        old_buckets = self._old_buckets
+        stop = min(self._migrate_index + count, old_buckets.length())
+
+        for each in range(self._migrate_index, stop):
+            entry = old_buckets.get_at_index(each)
+            if entry is not None and entry.is_tombstone is False:
+                entry.is_tombstone = True
+                self._size -= 1
+                self._place(entry.key, entry.value, entry.hash, entry.expires)
+
+        self._migrate_index = stop
+        if stop == old_buckets.length():
+            self._old_buckets = None
+            self._old_bloom = None
+
+    def _evict_old(self, key: str, hash_val: int) -> HashEntry:
+        """
+        -Helper for _make_room() that tombstones any copy of key still waiting in the old table,
+        so the new table holds the only live entry once the put completes.
+
+        Parameters:
+            self(HashMap)
+            key(str): key being put
+            hash_val(int): full hash of key
+
+        Returns:
+            HashEntry: the evicted entry --> None if key was not in the old table
+        """
+        entry = self._find_entry(self._old_buckets, key, hash_val)
+        if entry is not None:
+            entry.is_tombstone = True
+            self._size -= 1
+            self._version += 1
+        return entry
+
     def clear(self) -> None:
         """
         Clears contents of HashMap. Do not touch underlying hash table capacity.
@@ -339,6 +792,12 @@ class HashMap:
         for each in range(self.get_capacity()):
             self._buckets.set_at_index(each, None)
         self._size = 0
+        self._tombstones = 0
+        self._version += 1
+        # abandon any incremental resize in progress
+        self._old_buckets = None
+        self._bloom = self._new_bloom(self.get_capacity())
+        self._old_bloom = None
         return
 
     def get_keys(self) -> DynamicArray:
@@ -353,11 +812,434 @@ class HashMap:
         """
         da = DynamicArray()
         # iterate hashmap buckets and append any non-null keys to empty DA --> return da
+        now = self._clock()
         for each in range(self.get_capacity()):
-            if self._buckets.get_at_index(each) is not None and self._buckets.get_at_index(each).is_tombstone is False:
+            if self._buckets.get_at_index(each) is not None and self._buckets.get_at_index(each).is_tombstone is False \
+                    and not self._is_expired(self._buckets.get_at_index(each), now):
                 da.append(self._buckets.get_at_index(each).key)
+        # keys not yet moved out of the old table during an incremental resize
+        if self._old_buckets is not None:
+            for each in range(self._migrate_index, self._old_buckets.length()):
+                entry = self._old_buckets.get_at_index(each)
+                if entry is not None and entry.is_tombstone is False and not self._is_expired(entry, now):
+                    da.append(entry.key)
         return da
 
+    @staticmethod
+    def _is_expired(entry: HashEntry, now: float) -> bool:
+        """
+        -Returns True if entry has an expiry time at or before now (nothing is reclaimed).
+
+        Parameters:
+            entry(HashEntry): entry to check
+            now(float): current clock() time
+
+        Returns:
+            bool: whether entry has expired
+        """
+        return entry.expires is not None and entry.expires <= now
+
+    # ------------------------------ ITERATION ------------------------------ #
+
+    def _live_entries(self):
+        """
+        -Generator over the live HashEntry objects, walking _buckets directly without copying them.
+            - an incremental resize in progress is completed first, so every entry sits in _buckets
+            - raises RuntimeError if the map is changed (put/remove/clear/resize) while iterating
+            - expired entries are skipped but not reclaimed
+
+        Parameters:
+            self(HashMap)
+
+        Yields:
+            HashEntry: each live entry, in bucket order
+        """
+        if self._old_buckets is not None:
+            self._migrate(self._old_buckets.length())
+
+        version = self._version
+        buckets = self._buckets
+        now = self._clock()
+        for each in range(buckets.length()):
+            entry = buckets.get_at_index(each)
+            if entry is not None and entry.is_tombstone is False and not self._is_expired(entry, now):
+                yield entry
+                if self._version != version:
+                    raise RuntimeError("HashMap changed during iteration")
+
+    def __iter__(self):
+        """
+        Iterate over the keys of the map (same as keys())
+        """
+        return self.keys()
+
+    def keys(self):
+        """
+        -Lazily yields every key in the map. Order does not matter.
+
+        Parameters:
+            self(HashMap)
+
+        Yields:
+            key of each entry
+        """
+        for entry in self._live_entries():
+            yield entry.key
+
+    def values(self):
+        """
+        -Lazily yields every value in the map. Order does not matter.
+
+        Parameters:
+            self(HashMap)
+
+        Yields:
+            value of each entry
+        """
+        for entry in self._live_entries():
+            yield entry.value
+
+    def items(self):
+        """
+        -Lazily yields every (key, value) pair in the map. Order does not matter.
+
+        Parameters:
+            self(HashMap)
+
+        Yields:
+            tuple: (key, value) of each entry
+        """
+        for entry in self._live_entries():
+            yield entry.key, entry.value
+
+    # ------------------------------ BATCH OPERATIONS ------------------------------ #
+
+    def put_many(self, pairs) -> None:
+        """
+        -Puts every (key, value) pair from the iterable. Same result as calling put() on each pair in order,
+        but the table is presized once for the whole batch, every key is hashed up front (vectorized by
+        bulk_hash when NumPy is available) and the pairs are placed bucket by bucket.
+
+        Parameters:
+            self(HashMap)
+            pairs(iterable): (key, value) pairs
+
+        Returns:
+            None
+        """
+        pairs = list(pairs)
+        hashes = hash_all([key for key, _ in pairs], self._hash_function)
+
+        # presize once --> smallest doubling that keeps the load factor under 0.5 after the whole batch
+        new_capacity = self.get_capacity()
+        while (self.get_size() + len(pairs)) / new_capacity >= 0.5:
+            new_capacity *= 2
+        # resizing also purges tombstones, so do it at the same capacity if they would crowd the batch out
+        if new_capacity != self.get_capacity() or \
+                (self.get_size() + self._tombstones + len(pairs)) / new_capacity >= 0.5:
+            self.resize_table(new_capacity)
+        elif self._old_buckets is not None:
+            self._migrate(self._old_buckets.length())
+
+        # group by bucket --> the sort is stable, so a key repeated in the batch keeps its last value
+        capacity = self.get_capacity()
+        for i in bucket_order(hashes, capacity):
+            if self._stats is not None:
+                self._probes = 0
+            self._place(pairs[i][0], pairs[i][1], hashes[i])
+            if self._stats is not None:
+                self._stats.record('put', self._probes)
+
+    def get_many(self, keys) -> DynamicArray:
+        """
+        -Looks up every key from the iterable. Keys are hashed up front and looked up bucket by bucket.
+
+        Parameters:
+            self(HashMap)
+            keys(iterable): keys we are searching for
+
+        Returns:
+            DynamicArray: value of each key in input order --> None for keys that DNE
+        """
+        keys = as_batch(keys)
+        hashes = hash_all(keys, self._hash_function)
+        values = [None] * len(keys)
+
+        capacity = self.get_capacity()
+        for i in bucket_order(hashes, capacity):
+            entry = self._lookup(keys[i], hashes[i])
+            if entry is not None:
+                values[i] = entry.value
+        return DynamicArray(values)
+
+    def remove_many(self, keys) -> None:
+        """
+        -Removes every key from the iterable. Keys are hashed up front and removed bucket by bucket.
+
+        Parameters:
+            self(HashMap)
+            keys(iterable): keys we are removing
+
+        Returns:
+            None
+        """
+        keys = as_batch(keys)
+        hashes = hash_all(keys, self._hash_function)
+
+        capacity = self.get_capacity()
+        for i in bucket_order(hashes, capacity):
+            self._remove_hashed(keys[i], hashes[i])
+
+    # ------------------------------ PERSISTENCE ------------------------------ #
+
+    def dump(self, path: str) -> None:
+        """
+        -Writes the map to path in the compact map_dump format: capacity, hash function name and, bucket by
+        bucket, each entry's index, cached hash, key and value. Tombstones are kept (index only), so probe
+        sequences running through them survive a reload. Entries are streamed to the file as they are read.
+            - an incremental resize in progress is completed first
+            - an entry with a ttl is stored with the time it has left; one that has already expired is written
+                as a tombstone (it is absent, but may sit in another key's probe sequence)
+
+        Parameters:
+            self(HashMap)
+            path(str): file to write
+
+        Returns:
+            None
+        """
+        if self._old_buckets is not None:
+            self._migrate(self._old_buckets.length())
+
+        now = self._clock()
+        with DumpWriter(path, b'O', self.get_capacity(), self._hash_function) as writer:
+            for each in range(self._buckets.length()):
+                entry = self._buckets.get_at_index(each)
+                if entry is None:
+                    continue
+                if entry.is_tombstone or self._is_expired(entry, now):
+                    writer.tombstone(each)
+                else:
+                    writer.entry(each, entry.hash, entry.key, entry.value,
+                                 None if entry.expires is None else entry.expires - now)
+
+    @classmethod
+    def load(cls, path: str, function=None, **options) -> "HashMap":
+        """
+        -Rebuilds a map written by dump(). Every entry goes straight back into its original bucket with its
+        cached hash --> no hashing, no probing and no put() calls.
+            - a stored ttl counts from now on the new map's clock
+
+        Parameters:
+            path(str): file written by dump()
+            function: hash function of the dumped map, or None to import it by its stored name
+            options: other HashMap constructor arguments (migrate_step, tombstone_limit, stats)
+
+        Returns:
+            HashMap: map with the dumped capacity and contents
+        """
+        capacity, function, records = read_dump(path, b'O', function)
+        hash_map = cls(capacity, function, **options)
+        now = hash_map._clock()
+
+        for index, hash_val, key, value, ttl in records:
+            entry = HashEntry(key, value, hash_val)
+            if ttl is not None:
+                entry.expires = now + ttl
+            if hash_val is None:
+                entry.is_tombstone = True
+                hash_map._tombstones += 1
+            else:
+                hash_map._size += 1
+                if hash_map._bloom is not None:
+                    hash_map._bloom.add(hash_val)
+            hash_map._buckets.set_at_index(index, entry)
+        return hash_map
+
+
+class SnapshotHashMap(HashMap):
+    """
+    HashMap whose readers never block on a writer.
+        - writers (put/remove/clear/resize_table and the batch versions) are serialized by one lock
+        - readers (get/contains_key/get_many/get_keys and keys/values/items iteration) take no lock: they read
+            the last published bucket array
+        - in-place writes are single reference stores (new entry into a slot, new value, tombstone flag),
+            so a published array is never seen half-written
+        - resize and clear build a new array and publish it once the write completes (copy-on-resize);
+            readers still holding the old array see the table as it was before the write
+    """
+    def __init__(self, capacity: int, function, tombstone_limit: float = 0.25, sweep_step: int = 0,
+                 clock=time.monotonic, bloom_bits: int = 0) -> None:
+        """
+        Initialize new HashMap that uses quadratic probing for collision resolution
+        and lock-free snapshot reads (incremental resizing and stats are not available in this mode)
+            - expired entries are only reclaimed by writers (put/remove/sweep); readers just skip them
+            - a Bloom filter (bloom_bits) is published together with the bucket array it covers
+        """
+        super().__init__(capacity, function, tombstone_limit=tombstone_limit, sweep_step=sweep_step, clock=clock,
+                         bloom_bits=bloom_bits)
+        self._write_lock = threading.RLock()
+        self._write_depth = 0
+        # thread currently holding the writer lock --> None while no write is running
+        self._writer = None
+        # bucket array (and its filter) readers probe --> only ever replaced, never emptied in place
+        self._read_buckets = self._buckets
+        self._read_bloom = self._bloom
+
+    @contextmanager
+    def _writing(self):
+        """
+        -Holds the writer lock for one write. When the outermost write finishes, the current bucket array is
+        published to readers, so a resize nested inside a put is never published half-filled.
+
+        Parameters:
+            self(SnapshotHashMap)
+        """
+        with self._write_lock:
+            self._write_depth += 1
+            self._writer = threading.get_ident()
+            try:
+                yield
+            finally:
+                self._write_depth -= 1
+                if self._write_depth == 0:
+                    self._writer = None
+                    self._read_buckets = self._buckets
+                    self._read_bloom = self._bloom
+
+    # ------------------------------ WRITERS ------------------------------ #
+
+    def put(self, key: str, value: object, ttl: float = None) -> None:
+        """
+        Same as HashMap.put(), under the writer lock (key is hashed before the lock is taken)
+        """
+        hash_val = self._hash_function(key)
+        with self._writing():
+            self._put_hashed(key, value, hash_val, None if ttl is None else self._clock() + ttl)
+
+    def remove(self, key: str) -> None:
+        """
+        Same as HashMap.remove(), under the writer lock (key is hashed before the lock is taken)
+        """
+        hash_val = self._hash_function(key)
+        with self._writing():
+            self._remove_hashed(key, hash_val)
+
+    def resize_table(self, new_capacity: int) -> None:
+        """
+        Same as HashMap.resize_table(), under the writer lock. Readers keep probing the old array until it finishes
+        """
+        with self._writing():
+            super().resize_table(new_capacity)
+
+    def clear(self) -> None:
+        """
+        Clears contents of HashMap by swapping in a new empty bucket array of the same capacity,
+        so readers of the old array are not disturbed.
+        """
+        with self._writing():
+            self._buckets = DynamicArray([None] * self.get_capacity())
+            self._bloom = self._new_bloom(self.get_capacity())
+            self._size = 0
+            self._tombstones = 0
+            self._version += 1
+
+    def put_many(self, pairs) -> None:
+        """
+        Same as HashMap.put_many(), holding the writer lock for the whole batch
+        """
+        with self._writing():
+            super().put_many(pairs)
+
+    def remove_many(self, keys) -> None:
+        """
+        Same as HashMap.remove_many(), holding the writer lock for the whole batch
+        """
+        with self._writing():
+            super().remove_many(keys)
+
+    def _add_count(self, key: str, hash_val: int, delta: int) -> int:
+        """
+        Same as HashMap._add_count(), under the writer lock
+        """
+        with self._writing():
+            return super()._add_count(key, hash_val, delta)
+
+    # ------------------------------ READERS ------------------------------ #
+
+    def _lookup(self, key: str, hash_val: int) -> HashEntry:
+        """
+        -Reader side of get(), contains_key() and get_many(): probes the published bucket array without locking.
+
+        Parameters:
+            self(SnapshotHashMap)
+            key(str): key we are searching for
+            hash_val(int): full hash of key
+
+        Returns:
+            HashEntry: live entry for key --> return None if DNE
+        """
+        bloom = self._read_bloom
+        if bloom is not None and not bloom.might_contain(hash_val):
+            return None
+        return self._find_entry(self._read_buckets, key, hash_val)
+
+    def _expire(self, buckets: DynamicArray, entry: HashEntry) -> bool:
+        """
+        -Reports whether entry has expired. Only a writer holding the lock may turn it into a tombstone,
+        so lock-free readers leave it in place.
+
+        Parameters:
+            self(SnapshotHashMap)
+            buckets(DynamicArray): bucket array holding entry
+            entry(HashEntry): live entry with an expiry time
+
+        Returns:
+            bool: True if entry has expired
+        """
+        if self._writer != threading.get_ident():
+            return entry.expires <= self._clock()
+        return super()._expire(buckets, entry)
+
+    def sweep(self, count: int) -> int:
+        """
+        Same as HashMap.sweep(), under the writer lock
+        """
+        with self._writing():
+            return super().sweep(count)
+
+    def get_keys(self) -> DynamicArray:
+        """
+        Returns a DynamicArray that contains all keys of the published bucket array. Order does not matter.
+        """
+        da = DynamicArray()
+        buckets = self._read_buckets
+        now = self._clock()
+        for each in range(buckets.length()):
+            entry = buckets.get_at_index(each)
+            if entry is not None and entry.is_tombstone is False and not self._is_expired(entry, now):
+                da.append(entry.key)
+        return da
+
+    def _live_entries(self):
+        """
+        -Generator over the live HashEntry objects of the published bucket array, used by keys()/values()/items().
+            - a resize or clear only publishes a new array, so it never disturbs an iteration in progress
+                (no RuntimeError); in-place writes made while iterating may or may not be seen
+
+        Parameters:
+            self(SnapshotHashMap)
+
+        Yields:
+            HashEntry: each live entry, in bucket order
+        """
+        buckets = self._read_buckets
+        now = self._clock()
+        for each in range(buckets.length()):
+            entry = buckets.get_at_index(each)
+            if entry is not None and entry.is_tombstone is False and not self._is_expired(entry, now):
+                yield entry
+
 # ------------------- BASIC TESTING ---------------------------------------- #
 
 
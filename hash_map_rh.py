@@ -0,0 +1,365 @@
+# Name: Eugene Song
+# OSU Email: songeu@oregonstate.edu
+# Course: CS261 - Data Structures
+# Description: A HashMap implemented with Open Addressing and Robin Hood hashing. Entries that sit far from their
+#                   home bucket take the place of entries that sit closer to theirs, and removal shifts the
+#                       following run backwards instead of leaving tombstones, so probe lengths stay short even
+#                           at high load factors.
+
+
+from a6_include import (DynamicArray, HashEntry,
+                        hash_function_1, hash_function_2)
+
+
+class HashMap:
+    def __init__(self, capacity: int, function, max_load: float = 0.9) -> None:
+        """
+        Initialize new HashMap that uses
+        Robin Hood linear probing for collision resolution
+            - put() doubles the table once storing another entry would push the load factor past max_load;
+                the 0.9 default relies on Robin Hood displacement keeping probe lengths short near full
+                (no tombstones to purge), where quadratic probing needs to stay under 0.5
+        """
+        self._buckets = DynamicArray()
+        for _ in range(capacity):
+            self._buckets.append(None)
+
+        self._capacity = capacity
+        self._hash_function = function
+        self._size = 0
+        self._max_load = max_load
+
+    def __str__(self) -> str:
+        """
+        Override string method to provide more readable output
+        """
+        out = ''
+        for i in range(self._buckets.length()):
+            out += str(i) + ': ' + str(self._buckets[i]) + '\n'
+        return out
+
+    def get_size(self) -> int:
+        """
+        Return size of map
+        """
+        return self._size
+
+    def get_capacity(self) -> int:
+        """
+        Return capacity of map
+        """
+        return self._capacity
+
+    # ------------------------------------------------------------------ #
+
+    def _probe_distance(self, index: int, entry: HashEntry) -> int:
+        """
+        -Returns how far entry at index sits from its home bucket, using its cached hash.
+
+        Parameters:
+            self(HashMap)
+            index(int): bucket holding entry
+            entry(HashEntry): entry to measure
+
+        Returns:
+            int: number of steps from the home bucket to index
+        """
+        return (index - entry.hash % self._capacity) % self._capacity
+
+    def _find(self, key: str, hash_val: int) -> int:
+        """
+        -Returns the bucket index holding key.
+            - the search stops at an empty bucket or at an entry closer to its home than we are to ours,
+                since Robin Hood placement would have put key before it
+
+        Parameters:
+            self(HashMap)
+            key(str): key we are searching for
+            hash_val(int): full hash of key
+
+        Returns:
+            int: bucket index of key --> return -1 if DNE
+        """
+        capacity = self._capacity
+        index = hash_val % capacity
+
+        for distance in range(capacity):
+            current_position = self._buckets.get_at_index(index)
+            if current_position is None or self._probe_distance(index, current_position) < distance:
+                return -1
+            # cached hash compared before the key
+            if current_position.hash == hash_val and current_position.key == key:
+                return index
+            index = (index + 1) % capacity
+        return -1
+
+    def _place(self, key: str, value: object, hash_val: int) -> None:
+        """
+        -Inserts or updates key without checking the load factor. While walking the probe sequence,
+        the entry being carried swaps places with any resident that is closer to its own home bucket.
+
+        Parameters:
+            self(HashMap)
+            key(str): the identifier
+            value(object): the identifier's value
+            hash_val(int): full hash of key
+
+        Returns:
+            None
+        """
+        capacity = self._capacity
+        index = hash_val % capacity
+        carried = HashEntry(key, value, hash_val)
+        distance = 0
+        swapped = False
+
+        while True:
+            current_position = self._buckets.get_at_index(index)
+
+            # empty bucket --> carried entry settles here
+            if current_position is None:
+                self._buckets.set_at_index(index, carried)
+                self._size += 1
+                return
+
+            # key already exists --> update value (only possible before the first swap)
+            if not swapped and current_position.hash == hash_val and current_position.key == key:
+                current_position.value = value
+                return
+
+            # resident is richer (closer to home) than the carried entry --> take its bucket, carry it on
+            resident_distance = self._probe_distance(index, current_position)
+            if resident_distance < distance:
+                self._buckets.set_at_index(index, carried)
+                carried, distance = current_position, resident_distance
+                swapped = True
+
+            index = (index + 1) % capacity
+            distance += 1
+
+    def put(self, key: str, value: object) -> None:
+        """
+        -Updates the key/value pair in hash map. If given key already exists, its associated value must be replaced
+        with the new value. If given key does not exist, a key/value pair must be added.
+            - if one more entry would push the load factor past max_load, double the table first
+
+        Parameters:
+            self(HashMap)
+            key(str): the identifier
+            value(object): the identifier's value
+
+        Returns:
+            None
+        """
+        if (self._size + 1) / self._capacity > self._max_load:
+            self.resize_table(self._capacity * 2)
+
+        self._place(key, value, self._hash_function(key))
+
+    def table_load(self) -> float:
+        """
+        -Returns the current hash table's load factor.
+                load factor = # of total elements in table / # of buckets
+        Parameters:
+            self(HashMap)
+
+        Returns:
+            float: load factor for hash table
+        """
+        return self._size / self._capacity
+
+    def empty_buckets(self) -> int:
+        """
+        Returns the number of empty buckets. Exact, since removal never leaves tombstones behind.
+        Parameters:
+            self(HashMap)
+
+        Returns:
+            int: number of empty buckets
+        """
+        return self._capacity - self._size
+
+    def resize_table(self, new_capacity: int) -> None:
+        """
+        -Changes the capacity of the internal hash table. All existing key/value pairs remain and are placed
+        into the new table using their cached hashes. If new capacity is < 1 or < size --> do nothing
+
+        Parameters:
+            self(HashMap)
+            new_capacity(int): new internal capacity
+
+        Returns:
+            None
+        """
+        if new_capacity < 1 or new_capacity < self._size:
+            return
+
+        old_buckets = self._buckets
+        self._buckets = DynamicArray([None] * new_capacity)
+        self._capacity = new_capacity
+        self._size = 0
+
+        for each in range(old_buckets.length()):
+            entry = old_buckets.get_at_index(each)
+            if entry is not None:
+                self._place(entry.key, entry.value, entry.hash)
+
+    def get(self, key: str) -> object:
+        """
+        Returns value associated w/ given key. If key DNE --> return None
+
+        Parameters:
+            self(HashMap)
+            key(str): key we are searching for
+
+        Returns:
+            object: value of searched key --> return None if DNE
+        """
+        index = self._find(key, self._hash_function(key))
+        if index == -1:
+            return None
+        return self._buckets.get_at_index(index).value
+
+    def contains_key(self, key: str) -> bool:
+        """
+        Returns a boolean based on whether desired key is in HashMap.
+
+        Parameters:
+            self(HashMap)
+            key(str): key we are searching for
+
+        Returns:
+            bool:
+                Exist --> True
+                DNE --> False
+        """
+        if self._size == 0:
+            return False
+        return self._find(key, self._hash_function(key)) != -1
+
+    def remove(self, key: str) -> None:
+        """
+        Removes given key and its associated value from HashMap using backward-shift deletion:
+            every following entry that is not in its home bucket moves back one step, and the
+            last bucket of the run becomes empty
+
+        Parameters:
+            self(HashMap)
+            key(str): key we are removing
+
+        Returns:
+            None
+        """
+        index = self._find(key, self._hash_function(key))
+        if index == -1:
+            return
+
+        capacity = self._capacity
+        following = (index + 1) % capacity
+        while True:
+            next_entry = self._buckets.get_at_index(following)
+            if next_entry is None or self._probe_distance(following, next_entry) == 0:
+                break
+            self._buckets.set_at_index(index, next_entry)
+            index, following = following, (following + 1) % capacity
+
+        self._buckets.set_at_index(index, None)
+        self._size -= 1
+
+    def clear(self) -> None:
+        """
+        Clears contents of HashMap. Do not touch underlying hash table capacity.
+
+        Parameters:
+            self(HashMap)
+
+        Returns:
+            None
+        """
+        for each in range(self._capacity):
+            self._buckets.set_at_index(each, None)
+        self._size = 0
+
+    def get_keys(self) -> DynamicArray:
+        """
+        Returns a DynamicArray that contains all keys stored in the Hash Map. Order does not matter.
+
+        Parameters:
+            self(HashMap)
+
+        Returns:
+            da(DynamicArray): contains all valid keys in any order
+        """
+        da = DynamicArray()
+        for each in range(self._capacity):
+            if self._buckets.get_at_index(each) is not None:
+                da.append(self._buckets.get_at_index(each).key)
+        return da
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+
+if __name__ == "__main__":
+
+    print("\nPDF - put example 1")
+    print("-------------------")
+    m = HashMap(50, hash_function_1)
+    for i in range(150):
+        m.put('str' + str(i), i * 100)
+        if i % 25 == 24:
+            print(m.empty_buckets(), m.table_load(), m.get_size(), m.get_capacity())
+
+    print("\nPDF - put example 2")
+    print("-------------------")
+    m = HashMap(40, hash_function_2)
+    for i in range(50):
+        m.put('str' + str(i // 3), i * 100)
+        if i % 10 == 9:
+            print(m.empty_buckets(), m.table_load(), m.get_size(), m.get_capacity())
+
+    print("\nPDF - resize example 2")
+    print("----------------------")
+    m = HashMap(75, hash_function_2)
+    keys = [i for i in range(1, 1000, 13)]
+    for key in keys:
+        m.put(str(key), key * 42)
+    print(m.get_size(), m.get_capacity())
+
+    for capacity in range(111, 1000, 117):
+        m.resize_table(capacity)
+
+        m.put('some key', 'some value')
+        result = m.contains_key('some key')
+        m.remove('some key')
+
+        for key in keys:
+            # all inserted keys must be present
+            result &= m.contains_key(str(key))
+            # NOT inserted keys must be absent
+            result &= not m.contains_key(str(key + 1))
+        print(capacity, result, m.get_size(), m.get_capacity(), round(m.table_load(), 2))
+
+    print("\nPDF - remove example 1")
+    print("----------------------")
+    m = HashMap(50, hash_function_1)
+    print(m.get('key1'))
+    m.put('key1', 10)
+    print(m.get('key1'))
+    m.remove('key1')
+    print(m.get('key1'))
+    m.remove('key4')
+
+    print("\nPDF - get_keys example 1")
+    print("------------------------")
+    m = HashMap(10, hash_function_2)
+    for i in range(100, 200, 10):
+        m.put(str(i), str(i * 10))
+    print(m.get_keys())
+
+    m.resize_table(1)
+    print(m.get_keys())
+
+    m.put('200', '2000')
+    m.remove('100')
+    m.resize_table(2)
+    print(m.get_keys())
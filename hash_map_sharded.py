@@ -0,0 +1,443 @@
+# Name: Eugene Song
+# OSU Email: songeu@oregonstate.edu
+# Course: CS261 - Data Structures
+# Description: A HashMap front end that partitions keys by hash across worker processes. Each worker owns a local
+#                   hash_map_sc or hash_map_oa HashMap and serves requests over its own pipe, so batches sent
+#                       to different shards are processed on different cores at the same time.
+
+import multiprocessing
+
+import hash_map_sc
+from a6_include import (DynamicArray, hash_int_mix,
+                        hash_function_1, hash_function_2)
+from bulk_hash import hash_all
+
+
+def _serve(conn, engine, capacity: int, function, options: dict) -> None:
+    """
+    -Worker process loop. Owns one engine HashMap and answers (operation, argument) requests from conn
+    until 'close' arrives. Every request gets one reply: (True, result) or (False, exception).
+
+    Parameters:
+        conn(Connection): worker end of the pipe
+        engine: HashMap class of the shard (hash_map_sc.HashMap or hash_map_oa.HashMap)
+        capacity(int): starting capacity of the shard
+        function: hash function of the shard
+        options(dict): other engine constructor arguments
+
+    Returns:
+        None
+    """
+    hash_map = engine(capacity, function, **options)
+    while True:
+        operation, argument = conn.recv()
+        if operation == 'close':
+            conn.send((True, None))
+            break
+        try:
+            if operation == 'put':
+                result = hash_map.put(*argument)
+            elif operation == 'get':
+                result = hash_map.get(argument)
+            elif operation == 'contains_key':
+                result = hash_map.contains_key(argument)
+            elif operation == 'remove':
+                result = hash_map.remove(argument)
+            elif operation == 'put_many':
+                result = hash_map.put_many(argument)
+            elif operation == 'get_many':
+                values = hash_map.get_many(argument)
+                result = [values.get_at_index(i) for i in range(values.length())]
+            elif operation == 'remove_many':
+                result = hash_map.remove_many(argument)
+            elif operation == 'get_keys':
+                keys = hash_map.get_keys()
+                result = [keys.get_at_index(i) for i in range(keys.length())]
+            elif operation == 'counts':
+                result = (hash_map.get_size(), hash_map.get_capacity(), hash_map.empty_buckets())
+            elif operation == 'clear':
+                result = hash_map.clear()
+            elif operation == 'resize_table':
+                result = hash_map.resize_table(argument)
+            else:
+                raise ValueError("unknown operation " + repr(operation))
+            conn.send((True, result))
+        except Exception as error:
+            conn.send((False, error))
+    conn.close()
+
+
+class HashMap:
+    def __init__(self, capacity: int, function, shards: int = None, engine=hash_map_sc.HashMap,
+                 **options) -> None:
+        """
+        Initialize new HashMap whose keys are partitioned across worker processes
+            - shards defaults to the number of CPUs; capacity is split evenly across them
+            - engine is the HashMap class every shard runs (hash_map_sc.HashMap or hash_map_oa.HashMap),
+                options are passed on to its constructor
+            - a key's shard is picked from its hash mixed once more (hash_int_mix), so the keys of one shard
+                still spread over all of that shard's buckets
+            - function must be importable by the workers (a module-level function)
+            - single-key calls cost one pipe round trip; the batch calls talk to every shard at once and are
+                the way to get throughput that grows with the number of cores
+        """
+        self._shard_count = shards or multiprocessing.cpu_count()
+        self._hash_function = function
+        per_shard = max(-(-capacity // self._shard_count), 1)
+
+        self._conns = []
+        self._workers = []
+        for _ in range(self._shard_count):
+            parent_conn, child_conn = multiprocessing.Pipe()
+            worker = multiprocessing.Process(target=_serve, args=(child_conn, engine, per_shard, function, options),
+                                             daemon=True)
+            worker.start()
+            child_conn.close()
+            self._conns.append(parent_conn)
+            self._workers.append(worker)
+
+    def __enter__(self) -> "HashMap":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """
+        -Stops every worker process. The map cannot be used afterwards.
+
+        Parameters:
+            self(HashMap)
+
+        Returns:
+            None
+        """
+        for conn in self._conns:
+            conn.send(('close', None))
+        for conn, worker in zip(self._conns, self._workers):
+            conn.recv()
+            conn.close()
+            worker.join()
+        self._conns = []
+        self._workers = []
+
+    def get_size(self) -> int:
+        """
+        Return size of map (sum over every shard)
+        """
+        return sum(counts[0] for counts in self._broadcast('counts'))
+
+    def get_capacity(self) -> int:
+        """
+        Return capacity of map (sum over every shard)
+        """
+        return sum(counts[1] for counts in self._broadcast('counts'))
+
+    # ------------------------------------------------------------------ #
+
+    def _shard(self, key: str) -> int:
+        """
+        -Returns the shard number that owns key.
+
+        Parameters:
+            self(HashMap)
+            key(str): the identifier
+
+        Returns:
+            int: shard number
+        """
+        return hash_int_mix(self._hash_function(key)) % self._shard_count
+
+    @staticmethod
+    def _reply(conn) -> object:
+        """
+        -Receives one reply from a worker, re-raising any exception the worker hit.
+
+        Parameters:
+            conn(Connection): parent end of the worker's pipe
+
+        Returns:
+            object: result of the request
+        """
+        ok, result = conn.recv()
+        if not ok:
+            raise result
+        return result
+
+    def _request(self, shard: int, operation: str, argument: object = None) -> object:
+        """
+        -Sends one request to one shard and waits for its reply.
+
+        Parameters:
+            self(HashMap)
+            shard(int): shard number
+            operation(str): operation name understood by _serve()
+            argument(object): argument of the operation
+
+        Returns:
+            object: result of the request
+        """
+        conn = self._conns[shard]
+        conn.send((operation, argument))
+        return self._reply(conn)
+
+    def _broadcast(self, operation: str, arguments: list = None) -> list:
+        """
+        -Sends a request to every shard first and only then collects the replies, so the shards work in parallel.
+            - arguments holds one argument per shard; a shard whose argument is None is skipped
+            - every reply is read before the first worker exception is re-raised, so no reply is left in a pipe
+
+        Parameters:
+            self(HashMap)
+            operation(str): operation name understood by _serve()
+            arguments(list): argument for each shard, or None to send no argument to all of them
+
+        Returns:
+            list: reply of each shard in shard order (None for skipped shards)
+        """
+        if arguments is None:
+            arguments = [()] * self._shard_count
+
+        for conn, argument in zip(self._conns, arguments):
+            if argument is not None:
+                conn.send((operation, argument))
+
+        results = []
+        error = None
+        for conn, argument in zip(self._conns, arguments):
+            if argument is None:
+                results.append(None)
+                continue
+            ok, result = conn.recv()
+            if not ok and error is None:
+                error = result
+            results.append(result if ok else None)
+        if error is not None:
+            raise error
+        return results
+
+    def _partition(self, items: list, key_of) -> list:
+        """
+        -Splits items into one list per shard, keeping input order inside each list.
+            - keys are hashed up front (vectorized by bulk_hash when NumPy is available)
+
+        Parameters:
+            self(HashMap)
+            items(list): items to split
+            key_of: function returning the key of an item
+
+        Returns:
+            list: (item positions, items) for each shard --> None for shards that got nothing
+        """
+        parts = [None] * self._shard_count
+        hashes = hash_all([key_of(item) for item in items], self._hash_function)
+        for position, item in enumerate(items):
+            shard = hash_int_mix(hashes[position]) % self._shard_count
+            if parts[shard] is None:
+                parts[shard] = ([], [])
+            parts[shard][0].append(position)
+            parts[shard][1].append(item)
+        return parts
+
+    def put(self, key: str, value: object) -> None:
+        """
+        -Updates the key/value pair in the shard that owns key.
+
+        Parameters:
+            self(HashMap)
+            key(str): the identifier
+            value(object): the identifier's value
+
+        Returns:
+            None
+        """
+        self._request(self._shard(key), 'put', (key, value))
+
+    def get(self, key: str) -> object:
+        """
+        -Returns the value associated with given key. If key does not exist --> return None
+
+        Parameters:
+            self(HashMap)
+            key(str): key to search for
+
+        Returns:
+            object: value associated with given key
+        """
+        return self._request(self._shard(key), 'get', key)
+
+    def contains_key(self, key: str) -> bool:
+        """
+        -Returns True if given key exists in the hash map, otherwise return False.
+
+        Parameters:
+            self(HashMap)
+            key(str): key to search for
+
+        Returns:
+            bool: whether key exists or not
+        """
+        return self._request(self._shard(key), 'contains_key', key)
+
+    def remove(self, key: str) -> None:
+        """
+        -Removes the given key and its associated value from the hash map. If key does not exist --> do nothing
+
+        Parameters:
+            self(HashMap)
+            key(str): key to remove
+
+        Returns:
+            None
+        """
+        self._request(self._shard(key), 'remove', key)
+
+    def empty_buckets(self) -> int:
+        """
+        -Returns the number of empty buckets over every shard.
+
+        Parameters:
+            self(HashMap)
+
+        Returns:
+            int: number of empty buckets
+        """
+        return sum(counts[2] for counts in self._broadcast('counts'))
+
+    def table_load(self) -> float:
+        """
+        -Returns the load factor of the whole map.
+                load factor = # of total elements in every shard / # of buckets in every shard
+        Parameters:
+            self(HashMap)
+
+        Returns:
+            float: load factor
+        """
+        counts = self._broadcast('counts')
+        return sum(count[0] for count in counts) / sum(count[1] for count in counts)
+
+    def clear(self) -> None:
+        """
+        -Clears every shard. Does not change the underlying capacity.
+
+        Parameters:
+            self(HashMap)
+
+        Returns:
+            None
+        """
+        self._broadcast('clear')
+
+    def resize_table(self, new_capacity: int) -> None:
+        """
+        -Resizes every shard to an even share of new_capacity. If new capacity is < 1 --> do nothing
+
+        Parameters:
+            self(HashMap)
+            new_capacity(int): new total capacity
+
+        Returns:
+            None
+        """
+        if new_capacity < 1:
+            return
+        per_shard = max(-(-new_capacity // self._shard_count), 1)
+        self._broadcast('resize_table', [per_shard] * self._shard_count)
+
+    def get_keys(self) -> DynamicArray:
+        """
+        -Returns a DynamicArray that contains the keys of every shard. Order does not matter.
+
+        Parameters:
+            self(HashMap)
+
+        Returns:
+            DynamicArray: all keys
+        """
+        keys = []
+        for shard_keys in self._broadcast('get_keys'):
+            keys.extend(shard_keys)
+        return DynamicArray(keys)
+
+    # ------------------------------ BATCH OPERATIONS ------------------------------ #
+
+    def put_many(self, pairs) -> None:
+        """
+        -Puts every (key, value) pair from the iterable. Pairs are grouped by shard and every shard
+        runs its own put_many at the same time.
+
+        Parameters:
+            self(HashMap)
+            pairs(iterable): (key, value) pairs
+
+        Returns:
+            None
+        """
+        parts = self._partition(list(pairs), lambda pair: pair[0])
+        self._broadcast('put_many', [part and part[1] for part in parts])
+
+    def get_many(self, keys) -> DynamicArray:
+        """
+        -Looks up every key from the iterable, every shard looking up its own keys at the same time.
+
+        Parameters:
+            self(HashMap)
+            keys(iterable): keys we are searching for
+
+        Returns:
+            DynamicArray: value of each key in input order --> None for keys that DNE
+        """
+        keys = list(keys)
+        parts = self._partition(keys, lambda key: key)
+        replies = self._broadcast('get_many', [part and part[1] for part in parts])
+
+        values = [None] * len(keys)
+        for part, reply in zip(parts, replies):
+            if part is not None:
+                for position, value in zip(part[0], reply):
+                    values[position] = value
+        return DynamicArray(values)
+
+    def remove_many(self, keys) -> None:
+        """
+        -Removes every key from the iterable, every shard removing its own keys at the same time.
+
+        Parameters:
+            self(HashMap)
+            keys(iterable): keys we are removing
+
+        Returns:
+            None
+        """
+        parts = self._partition(list(keys), lambda key: key)
+        self._broadcast('remove_many', [part and part[1] for part in parts])
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+
+if __name__ == "__main__":
+
+    import hash_map_oa
+
+    print("\nput/get/remove on 4 shards")
+    print("--------------------------")
+    with HashMap(50, hash_function_1, shards=4) as m:
+        for i in range(150):
+            m.put('str' + str(i), i * 100)
+        print(m.get_size(), m.get('str7'), m.contains_key('str149'), m.contains_key('str150'))
+        m.remove('str7')
+        print(m.get_size(), m.get('str7'), m.get_keys().length())
+
+    print("\nbatch operations on open addressing shards")
+    print("------------------------------------------")
+    with HashMap(100, hash_function_2, shards=3, engine=hash_map_oa.HashMap) as m:
+        m.put_many(('key' + str(i), i) for i in range(1000))
+        m.remove_many('key' + str(i) for i in range(0, 1000, 2))
+        values = m.get_many(['key1', 'key2', 'key999', 'missing'])
+        print(m.get_size(), values)
+        m.resize_table(4000)
+        print(m.get_size(), m.get_capacity() >= 4000, round(m.table_load(), 2))
+        m.clear()
+        print(m.get_size(), m.empty_buckets() == m.get_capacity())
@@ -0,0 +1,361 @@
+# Name: Eugene Song
+# OSU Email: songeu@oregonstate.edu
+# Course: CS261 - Data Structures
+# Description: An alternative Open Addressing HashMap with Quadratic Probing. Instead of one HashEntry object per
+#                   slot, the table is stored as parallel flat arrays (keys, values, cached hashes and a slot
+#                       state byte) so probing never dereferences a per-entry object.
+
+
+from a6_include import (DynamicArray,
+                        hash_function_1, hash_function_2)
+
+# slot states stored in the _states bytearray
+_EMPTY = 0
+_LIVE = 1
+_TOMBSTONE = 2
+
+
+class HashMap:
+    def __init__(self, capacity: int, function) -> None:
+        """
+        Initialize new HashMap that uses quadratic probing for collision resolution
+        and struct-of-arrays storage for its slots
+        """
+        self._keys = [None] * capacity
+        self._values = [None] * capacity
+        self._hashes = [0] * capacity
+        self._states = bytearray(capacity)
+
+        self._capacity = capacity
+        self._hash_function = function
+        self._size = 0
+
+    def __str__(self) -> str:
+        """
+        Override string method to provide more readable output
+        """
+        out = ''
+        for i in range(self._capacity):
+            if self._states[i] == _EMPTY:
+                out += str(i) + ': None\n'
+            else:
+                out += f"{i}: K: {self._keys[i]} V: {self._values[i]} TS: {self._states[i] == _TOMBSTONE}\n"
+        return out
+
+    def get_size(self) -> int:
+        """
+        Return size of map
+        """
+        return self._size
+
+    def get_capacity(self) -> int:
+        """
+        Return capacity of map
+        """
+        return self._capacity
+
+    # ------------------------------------------------------------------ #
+
+    def _find(self, key: str, hash_val: int) -> int:
+        """
+        -Helper that walks the quadratic probe sequence for key and returns the index of its live slot.
+            - the probe sequence repeats after capacity steps, so the walk is bounded by capacity
+
+        Parameters:
+            self(HashMap)
+            key(str): key we are searching for
+            hash_val(int): full hash of key
+
+        Returns:
+            int: slot index of key, or -1 if key DNE
+        """
+        capacity = self._capacity
+        states, hashes, keys = self._states, self._hashes, self._keys
+        index = hash_val % capacity
+
+        for move_by in range(capacity):
+            probe = (index + move_by * move_by) % capacity
+            state = states[probe]
+            # empty slot ends the probe sequence --> DNE
+            if state == _EMPTY:
+                return -1
+            # compare cached hashes before falling back to key comparison
+            if state == _LIVE and hashes[probe] == hash_val and keys[probe] == key:
+                return probe
+        return -1
+
+    def _place(self, key: str, value: object, hash_val: int) -> bool:
+        """
+        -Helper that inserts or updates key without checking the load factor.
+            - the first tombstone on the probe sequence is reused once key is known to be absent
+
+        Parameters:
+            self(HashMap)
+            key(str): the identifier
+            value(object): the identifier's value
+            hash_val(int): full hash of key
+
+        Returns:
+            bool: False if the probe sequence had no free slot, True otherwise
+        """
+        capacity = self._capacity
+        states, hashes, keys = self._states, self._hashes, self._keys
+        index = hash_val % capacity
+        free = -1
+
+        for move_by in range(capacity):
+            probe = (index + move_by * move_by) % capacity
+            state = states[probe]
+            if state == _EMPTY:
+                if free == -1:
+                    free = probe
+                break
+            if state == _TOMBSTONE:
+                if free == -1:
+                    free = probe
+            elif hashes[probe] == hash_val and keys[probe] == key:
+                # key already exists --> update value
+                self._values[probe] = value
+                return True
+
+        if free == -1:
+            return False
+
+        keys[free] = key
+        self._values[free] = value
+        hashes[free] = hash_val
+        states[free] = _LIVE
+        self._size += 1
+        return True
+
+    def put(self, key: str, value: object) -> None:
+        """
+        -Updates the key/value pair in hash map. If given key already exists, its associated value must be replaced
+        with the new value. If given key does not exist, a key/value pair must be added.
+            - remember, if the load factor is greater than or equal to 0.5,
+                    resize the table before putting the new key/value pair
+
+        Parameters:
+            self(HashMap)
+            key(str): the identifier
+            value(object): the identifier's value
+
+        Returns:
+            None
+        """
+        if self.table_load() >= 0.5:
+            self.resize_table(self._capacity * 2)
+
+        hash_val = self._hash_function(key)
+        # probe sequence exhausted without a free slot --> grow and try again
+        while not self._place(key, value, hash_val):
+            self.resize_table(self._capacity * 2)
+
+    def table_load(self) -> float:
+        """
+        -Returns the current hash table's load factor.
+                load factor = # of total elements in table / # of buckets
+        Parameters:
+            self(HashMap)
+
+        Returns:
+            float: load factor for hash table
+        """
+        return self._size / self._capacity
+
+    def empty_buckets(self) -> int:
+        """
+        Returns the number of empty buckets.
+            algorithm: # of total buckets - # of elements
+        Parameters:
+            self(HashMap)
+
+        Returns:
+            int: number of empty buckets
+        """
+        return self._capacity - self._size
+
+    def resize_table(self, new_capacity: int) -> None:
+        """
+        -Changes the capacity of the internal hash table. All existing key/value pairs remain and are placed
+        into the new arrays using their cached hashes. If new capacity is < 1 or < size --> do nothing
+            - quadratic probing only reaches part of a table, so a nearly full new capacity may leave a key
+                without a free slot; the old arrays are then restored and the resize retried at capacity + 1,
+                so the resulting capacity can be a little larger than asked for
+
+        Parameters:
+            self(HashMap)
+            new_capacity(int): new internal capacity
+
+        Returns:
+            None
+        """
+        if new_capacity < 1 or new_capacity < self._size:
+            return
+
+        old_keys, old_values = self._keys, self._values
+        old_hashes, old_states = self._hashes, self._states
+
+        self._keys = [None] * new_capacity
+        self._values = [None] * new_capacity
+        self._hashes = [0] * new_capacity
+        self._states = bytearray(new_capacity)
+        self._capacity = new_capacity
+        self._size = 0
+
+        for each in range(len(old_states)):
+            if old_states[each] == _LIVE:
+                if not self._place(old_keys[each], old_values[each], old_hashes[each]):
+                    # quadratic probing could not reach a free slot --> retry one size up
+                    self._keys, self._values = old_keys, old_values
+                    self._hashes, self._states = old_hashes, old_states
+                    self._capacity = len(old_states)
+                    self._size = sum(1 for state in old_states if state == _LIVE)
+                    self.resize_table(new_capacity + 1)
+                    return
+
+    def get(self, key: str) -> object:
+        """
+        Returns value associated w/ given key. If key DNE --> return None
+
+        Parameters:
+            self(HashMap)
+            key(str): key we are searching for
+
+        Returns:
+            object: value of searched key --> return None if DNE
+        """
+        index = self._find(key, self._hash_function(key))
+        if index == -1:
+            return None
+        return self._values[index]
+
+    def contains_key(self, key: str) -> bool:
+        """
+        Returns a boolean based on whether desired key is in HashMap.
+
+        Parameters:
+            self(HashMap)
+            key(str): key we are searching for
+
+        Returns:
+            bool:
+                Exist --> True
+                DNE --> False
+        """
+        if self._size == 0:
+            return False
+        return self._find(key, self._hash_function(key)) != -1
+
+    def remove(self, key: str) -> None:
+        """
+        Removes given key and its associated value from HashMap --> "remove" by marking its slot as a tombstone
+
+        Parameters:
+            self(HashMap)
+            key(str): key we are removing
+
+        Returns:
+            None
+        """
+        index = self._find(key, self._hash_function(key))
+        if index == -1:
+            return
+
+        self._states[index] = _TOMBSTONE
+        # drop references so removed keys/values can be collected
+        self._keys[index] = None
+        self._values[index] = None
+        self._size -= 1
+
+    def clear(self) -> None:
+        """
+        Clears contents of HashMap. Do not touch underlying hash table capacity.
+
+        Parameters:
+            self(HashMap)
+
+        Returns:
+            None
+        """
+        capacity = self._capacity
+        self._keys = [None] * capacity
+        self._values = [None] * capacity
+        self._hashes = [0] * capacity
+        self._states = bytearray(capacity)
+        self._size = 0
+
+    def get_keys(self) -> DynamicArray:
+        """
+        Returns a DynamicArray that contains all keys stored in the Hash Map. Order does not matter.
+
+        Parameters:
+            self(HashMap)
+
+        Returns:
+            da(DynamicArray): contains all valid keys in any order
+        """
+        da = DynamicArray()
+        states, keys = self._states, self._keys
+        for each in range(self._capacity):
+            if states[each] == _LIVE:
+                da.append(keys[each])
+        return da
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+
+if __name__ == "__main__":
+
+    print("\nPDF - put example 1")
+    print("-------------------")
+    m = HashMap(50, hash_function_1)
+    for i in range(150):
+        m.put('str' + str(i), i * 100)
+        if i % 25 == 24:
+            print(m.empty_buckets(), m.table_load(), m.get_size(), m.get_capacity())
+
+    print("\nPDF - put example 2")
+    print("-------------------")
+    m = HashMap(40, hash_function_2)
+    for i in range(50):
+        m.put('str' + str(i // 3), i * 100)
+        if i % 10 == 9:
+            print(m.empty_buckets(), m.table_load(), m.get_size(), m.get_capacity())
+
+    print("\nPDF - resize example 2")
+    print("----------------------")
+    m = HashMap(75, hash_function_2)
+    keys = [i for i in range(1, 1000, 13)]
+    for key in keys:
+        m.put(str(key), key * 42)
+    print(m.get_size(), m.get_capacity())
+
+    for capacity in range(111, 1000, 117):
+        m.resize_table(capacity)
+
+        m.put('some key', 'some value')
+        result = m.contains_key('some key')
+        m.remove('some key')
+
+        for key in keys:
+            # all inserted keys must be present
+            result &= m.contains_key(str(key))
+            # NOT inserted keys must be absent
+            result &= not m.contains_key(str(key + 1))
+        print(capacity, result, m.get_size(), m.get_capacity(), round(m.table_load(), 2))
+
+    print("\nPDF - get_keys example 1")
+    print("------------------------")
+    m = HashMap(10, hash_function_2)
+    for i in range(100, 200, 10):
+        m.put(str(i), str(i * 10))
+    print(m.get_keys())
+
+    m.resize_table(1)
+    print(m.get_keys())
+
+    m.put('200', '2000')
+    m.remove('100')
+    m.resize_table(2)
+    print(m.get_keys())
@@ -0,0 +1,426 @@
+# Name: Eugene Song
+# OSU Email: songeu@oregonstate.edu
+# Course: CS261 - Data Structures
+# Description: A durable HashMap front end. Every put/remove/clear is appended to a write-ahead log that is fsynced
+#                   in groups, the map is checkpointed with dump() so the log can be truncated, and opening the
+#                       directory again rebuilds the map from the last checkpoint plus a replay of the log.
+
+import os
+import struct
+import threading
+import time
+import zlib
+
+import hash_map_sc
+from a6_include import (DynamicArray,
+                        hash_function_1, hash_function_2, hash_siphash, hash_builtin, hash_int_mix)
+from map_dump import encode_object, decode_object
+
+# ------------------------------ LOG FORMAT ------------------------------ #
+#   record   payload length, crc32 of payload, payload
+#   payload  b'P' key value  |  b'R' key  |  b'C'      (key/value encoded as in map_dump)
+#
+# Recovery replays records up to the first short or corrupt one (a write torn by a crash) and cuts the log there.
+# A checkpoint is written to a temporary file and renamed over the old one before the log is emptied, so a crash
+# at any point leaves a checkpoint plus a log that, replayed in order, give back the last synced state.
+# Replaying a record the checkpoint already holds changes nothing, since put/remove/clear only ever set state.
+# A write is applied to the map before its record is logged (both under the lock), so a put the map rejects
+# never reaches the log where it would fail again on every replay.
+
+_FRAME = struct.Struct('<II')
+_PUT = b'P'
+_REMOVE = b'R'
+_CLEAR = b'C'
+
+_LOG_NAME = 'wal.log'
+_CHECKPOINT_NAME = 'checkpoint.dump'
+
+
+class HashMap:
+    def __init__(self, directory: str, function, capacity: int = 11, engine=hash_map_sc.HashMap,
+                 group_size: int = 128, group_delay: float = 0.005, checkpoint_every: int = 100000,
+                 **options) -> None:
+        """
+        Initialize durable HashMap stored in directory (created if needed)
+            - engine is the in-memory HashMap class (hash_map_sc.HashMap or hash_map_oa.HashMap), built with
+                capacity, function and options when the directory holds no checkpoint yet
+            - group commit: the log is fsynced once group_size records are waiting, or group_delay seconds
+                after the first waiting record (a background thread covers idle periods); call sync() to
+                make every record so far durable right away
+            - checkpoint_every records logged since the last checkpoint trigger checkpoint()
+            - function must hash the same way in every process, or the checkpoint cannot be loaded again:
+                the randomly keyed hash_siphash is rejected (use make_siphash with fixed keys), and so are
+                hash_builtin/hash_int_mix unless PYTHONHASHSEED is pinned, since they hash str keys with hash()
+        """
+        if function is hash_siphash:
+            raise ValueError("hash_siphash is keyed per process; use make_siphash with fixed keys")
+        if function in (hash_builtin, hash_int_mix) and not os.environ.get('PYTHONHASHSEED', 'random').isdigit():
+            raise ValueError(function.__name__ + " needs PYTHONHASHSEED pinned to give the same hashes on reopen")
+        os.makedirs(directory, exist_ok=True)
+        self._log_path = os.path.join(directory, _LOG_NAME)
+        self._checkpoint_path = os.path.join(directory, _CHECKPOINT_NAME)
+        self._directory = directory
+
+        if os.path.exists(self._checkpoint_path):
+            self._map = engine.load(self._checkpoint_path, function, **options)
+        else:
+            self._map = engine(capacity, function, **options)
+        self._logged = self._replay()
+
+        self._group_size = group_size
+        self._group_delay = group_delay
+        self._checkpoint_every = checkpoint_every
+
+        # records written to the log file but not fsynced yet, and when the oldest of them was written
+        self._waiting = 0
+        self._first_waiting = 0.0
+        self._lock = threading.Lock()
+        self._log = open(self._log_path, 'ab')
+
+        self._closed = threading.Event()
+        self._flusher = threading.Thread(target=self._flush_loop, daemon=True)
+        self._flusher.start()
+
+    def __enter__(self) -> "HashMap":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __str__(self) -> str:
+        """
+        Override string method to provide more readable output
+        """
+        return str(self._map)
+
+    def get_size(self) -> int:
+        """
+        Return size of map
+        """
+        return self._map.get_size()
+
+    def get_capacity(self) -> int:
+        """
+        Return capacity of map
+        """
+        return self._map.get_capacity()
+
+    def close(self) -> None:
+        """
+        Sync the log and stop the background flusher. The map cannot be used afterwards.
+        """
+        if self._closed.is_set():
+            return
+        self._closed.set()
+        self._flusher.join()
+        self.sync()
+        self._log.close()
+
+    # ------------------------------------------------------------------ #
+
+    def _replay(self) -> int:
+        """
+        -Applies every complete record of the log to the map, then cuts off a torn tail if there is one.
+
+        Parameters:
+            self(HashMap)
+
+        Returns:
+            int: number of records replayed
+        """
+        if not os.path.exists(self._log_path):
+            return 0
+        with open(self._log_path, 'rb') as f:
+            data = f.read()
+
+        offset = count = 0
+        while offset + _FRAME.size <= len(data):
+            length, crc = _FRAME.unpack_from(data, offset)
+            payload = data[offset + _FRAME.size:offset + _FRAME.size + length]
+            if len(payload) != length or zlib.crc32(payload) != crc:
+                break
+            self._apply(payload)
+            offset += _FRAME.size + length
+            count += 1
+
+        if offset != len(data):
+            with open(self._log_path, 'r+b') as f:
+                f.truncate(offset)
+                os.fsync(f.fileno())
+        return count
+
+    def _apply(self, payload: bytes) -> None:
+        """
+        -Applies one log record to the in-memory map.
+
+        Parameters:
+            self(HashMap)
+            payload(bytes): record payload
+
+        Returns:
+            None
+        """
+        operation = payload[:1]
+        if operation == _CLEAR:
+            self._map.clear()
+            return
+        key, offset = decode_object(payload, 1)
+        if operation == _PUT:
+            self._map.put(key, decode_object(payload, offset)[0])
+        elif operation == _REMOVE:
+            self._map.remove(key)
+        else:
+            raise ValueError("corrupt write-ahead log record")
+
+    def _append(self, payload: bytes, operation, *arguments) -> None:
+        """
+        -Applies operation to the map, then appends its record to the log and fsyncs the group once it is full
+        or has waited group_delay.
+            - if operation raises, or returns False (nothing to do), no record is written
+
+        Parameters:
+            self(HashMap)
+            payload(bytes): record payload
+            operation: map method carrying out the write
+            arguments: arguments of operation
+
+        Returns:
+            None
+        """
+        with self._lock:
+            if operation(*arguments) is False:
+                return
+            self._log.write(_FRAME.pack(len(payload), zlib.crc32(payload)) + payload)
+            if self._waiting == 0:
+                self._first_waiting = time.monotonic()
+            self._waiting += 1
+            if self._waiting >= self._group_size or time.monotonic() - self._first_waiting >= self._group_delay:
+                self._sync_locked()
+            self._logged += 1
+
+    def _remove_present(self, key: str) -> bool:
+        """
+        -Removes key from the map if it is there.
+
+        Parameters:
+            self(HashMap)
+            key(str): key to remove
+
+        Returns:
+            bool: False if key DNE, True otherwise
+        """
+        if not self._map.contains_key(key):
+            return False
+        self._map.remove(key)
+        return True
+
+    def _after_write(self) -> None:
+        """
+        -Called once a logged write has been applied to the map: checkpoints after checkpoint_every records.
+
+        Parameters:
+            self(HashMap)
+
+        Returns:
+            None
+        """
+        if self._logged >= self._checkpoint_every:
+            self.checkpoint()
+
+    def _sync_locked(self) -> None:
+        """
+        -Flushes and fsyncs the log. Caller must hold self._lock.
+
+        Parameters:
+            self(HashMap)
+
+        Returns:
+            None
+        """
+        if self._waiting:
+            self._log.flush()
+            os.fsync(self._log.fileno())
+            self._waiting = 0
+
+    def _flush_loop(self) -> None:
+        """
+        -Background thread: syncs records that have waited group_delay while no further writes came in.
+
+        Parameters:
+            self(HashMap)
+
+        Returns:
+            None
+        """
+        while not self._closed.wait(self._group_delay):
+            with self._lock:
+                if self._waiting and time.monotonic() - self._first_waiting >= self._group_delay:
+                    self._sync_locked()
+
+    def sync(self) -> None:
+        """
+        -Makes every record logged so far durable.
+
+        Parameters:
+            self(HashMap)
+
+        Returns:
+            None
+        """
+        with self._lock:
+            self._sync_locked()
+
+    def checkpoint(self) -> None:
+        """
+        -Dumps the map to a new checkpoint and empties the log.
+            - the dump goes to a temporary file that is fsynced and renamed over the old checkpoint,
+                so a crash part way through leaves the previous checkpoint and the full log in place
+
+        Parameters:
+            self(HashMap)
+
+        Returns:
+            None
+        """
+        temporary = self._checkpoint_path + '.tmp'
+        with self._lock:
+            self._sync_locked()
+            self._map.dump(temporary)
+            with open(temporary, 'rb') as f:
+                os.fsync(f.fileno())
+            os.replace(temporary, self._checkpoint_path)
+            if hasattr(os, 'O_DIRECTORY'):
+                directory = os.open(self._directory, os.O_DIRECTORY)
+                try:
+                    os.fsync(directory)
+                finally:
+                    os.close(directory)
+
+            self._log.truncate(0)
+            os.fsync(self._log.fileno())
+            self._logged = 0
+
+    def put(self, key: str, value: object) -> None:
+        """
+        -Updates the key/value pair in the map, then logs the put.
+
+        Parameters:
+            self(HashMap)
+            key(str): the identifier
+            value(object): the identifier's value
+
+        Returns:
+            None
+        """
+        self._append(_PUT + encode_object(key) + encode_object(value), self._map.put, key, value)
+        self._after_write()
+
+    def remove(self, key: str) -> None:
+        """
+        -Removes the given key from the map, then logs the removal. If key does not exist --> do nothing
+            - removing a key that DNE is not logged
+
+        Parameters:
+            self(HashMap)
+            key(str): key to remove
+
+        Returns:
+            None
+        """
+        self._append(_REMOVE + encode_object(key), self._remove_present, key)
+        self._after_write()
+
+    def clear(self) -> None:
+        """
+        -Clears the contents of the map, then logs the clear.
+
+        Parameters:
+            self(HashMap)
+
+        Returns:
+            None
+        """
+        self._append(_CLEAR, self._map.clear)
+        self._after_write()
+
+    def get(self, key: str) -> object:
+        """
+        Returns value associated w/ given key. If key DNE --> return None
+        """
+        return self._map.get(key)
+
+    def contains_key(self, key: str) -> bool:
+        """
+        Returns a boolean based on whether desired key is in HashMap.
+        """
+        return self._map.contains_key(key)
+
+    def empty_buckets(self) -> int:
+        """
+        Returns the number of empty buckets.
+        """
+        return self._map.empty_buckets()
+
+    def table_load(self) -> float:
+        """
+        Returns the current hash table's load factor.
+        """
+        return self._map.table_load()
+
+    def resize_table(self, new_capacity: int) -> None:
+        """
+        Changes the capacity of the in-memory table (not logged: it does not change the contents)
+        """
+        self._map.resize_table(new_capacity)
+
+    def get_keys(self) -> DynamicArray:
+        """
+        Returns a DynamicArray that contains all keys stored in the Hash Map. Order does not matter.
+        """
+        return self._map.get_keys()
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+
+if __name__ == "__main__":
+
+    import tempfile
+
+    import hash_map_oa
+
+    directory = tempfile.mkdtemp()
+
+    print("\nput/remove, then reopen from the log")
+    print("------------------------------------")
+    m = HashMap(directory, hash_function_1, 50)
+    for i in range(150):
+        m.put('str' + str(i), i * 100)
+    m.remove('str7')
+    m.close()
+    m = HashMap(directory, hash_function_1)
+    print(m.get_size(), m.get('str7'), m.get('str149'))
+
+    print("\ncheckpoint, more writes, torn last record, reopen")
+    print("-------------------------------------------------")
+    m.checkpoint()
+    m.put('after', 'checkpoint')
+    m.put('torn', 'write')
+    m.close()
+    with open(os.path.join(directory, _LOG_NAME), 'r+b') as f:
+        f.truncate(os.path.getsize(os.path.join(directory, _LOG_NAME)) - 3)
+    with HashMap(directory, hash_function_1) as m:
+        print(m.get_size(), m.get('after'), m.get('torn'), m.contains_key('str8'))
+        m.clear()
+        m.put('only', 1)
+    with HashMap(directory, hash_function_1) as m:
+        print(m.get_size(), m.get('only'))
+
+    print("\nopen addressing engine, automatic checkpoints")
+    print("---------------------------------------------")
+    directory = tempfile.mkdtemp()
+    with HashMap(directory, hash_function_2, engine=hash_map_oa.HashMap, checkpoint_every=100) as m:
+        for i in range(250):
+            m.put('key' + str(i), i)
+    with HashMap(directory, hash_function_2, engine=hash_map_oa.HashMap) as m:
+        print(m.get_size(), m.get('key249'), os.path.getsize(os.path.join(directory, _LOG_NAME)) > 0)
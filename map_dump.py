@@ -0,0 +1,314 @@
+# Name: Eugene Song
+# OSU Email: songeu@oregonstate.edu
+# Course: CS261 - Data Structures
+# Description: Compact binary dump format shared by the HashMap dump()/load() methods. A dump records the capacity,
+#                   the hash function's name and, for every occupied bucket, its index, the cached hash and the
+#                       key/value, so a load puts each entry straight back into its bucket without rehashing.
+
+import importlib
+import pickle
+import struct
+
+# ------------------------------ FILE FORMAT ------------------------------ #
+#   header   magic, map kind (b'S' chaining / b'O' open addressing), capacity, hash function name
+#   records  one per entry: b'E', bucket index, hash, key, value
+#               --> b'W' instead of b'E' when the hash is stored as a fixed 8-byte word
+#               --> preceded by b'L', remaining ttl (8-byte double) when the entry expires
+#            one per open addressing tombstone: b'T', bucket index
+#   end      b'Z'
+#
+# Integers (indices, lengths, hashes under 2^49) are unsigned LEB128 varints. Larger 64-bit hashes (fnv1a,
+# siphash, int_mix) take 8 bytes as a plain word, which is both shorter and faster than their varint. Keys and values are a type tag and a payload;
+# anything other than None/str/bytes/int/float is pickled. Records are streamed through a buffered file,
+# so a dump never holds a second copy of the map in memory.
+
+_MAGIC = b'HMDUMP01'
+_ENTRY = 0x45         # b'E'
+_WIDE_ENTRY = 0x57    # b'W'
+_TOMBSTONE = 0x54     # b'T'
+_TTL = 0x4C           # b'L'
+_END = 0x5A           # b'Z'
+_BUFFER_SIZE = 1 << 20
+
+# key/value type tags
+_NONE = 0
+_STR = 1
+_BYTES = 2
+_INT = 3
+_NEG_INT = 4
+_FLOAT = 5
+_PICKLE = 6
+
+_DOUBLE = struct.Struct('<d')
+_WORD = struct.Struct('<Q')
+_WIDE_HASH = 1 << 49
+
+
+def _varint(number: int) -> bytes:
+    """
+    -Encodes a non-negative int as an unsigned LEB128 varint.
+
+    Parameters:
+        number(int): value to encode
+
+    Returns:
+        bytes: 7 bits per byte, high bit set on every byte but the last
+    """
+    if number < 0x80:
+        return bytes((number,))
+    if number < 0x4000:
+        return bytes(((number & 0x7F) | 0x80, number >> 7))
+    out = bytearray()
+    while number > 0x7F:
+        out.append((number & 0x7F) | 0x80)
+        number >>= 7
+    out.append(number)
+    return bytes(out)
+
+
+def _read_varint(data: bytes, offset: int) -> tuple:
+    """
+    -Decodes the unsigned LEB128 varint at offset.
+
+    Parameters:
+        data(bytes): dump contents
+        offset(int): position of the varint
+
+    Returns:
+        tuple: (value, offset just past the varint)
+    """
+    byte = data[offset]
+    if byte < 0x80:
+        return byte, offset + 1
+    number = shift = 0
+    while True:
+        byte = data[offset]
+        offset += 1
+        number |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return number, offset
+        shift += 7
+
+
+def encode_object(value: object) -> bytes:
+    """
+    -Encodes a key or value as a type tag followed by its payload.
+
+    Parameters:
+        value(object): key or value
+
+    Returns:
+        bytes: encoded object
+    """
+    if value is None:
+        return bytes((_NONE,))
+    if type(value) is str:
+        payload = value.encode('utf-8')
+        return bytes((_STR,)) + _varint(len(payload)) + payload
+    if type(value) is bytes:
+        return bytes((_BYTES,)) + _varint(len(value)) + value
+    if type(value) is int:
+        return bytes((_INT,)) + _varint(value) if value >= 0 else bytes((_NEG_INT,)) + _varint(-value)
+    if type(value) is float:
+        return bytes((_FLOAT,)) + _DOUBLE.pack(value)
+    payload = pickle.dumps(value)
+    return bytes((_PICKLE,)) + _varint(len(payload)) + payload
+
+
+def decode_object(data: bytes, offset: int) -> tuple:
+    """
+    -Decodes the key or value at offset.
+
+    Parameters:
+        data(bytes): dump contents
+        offset(int): position of the type tag
+
+    Returns:
+        tuple: (object, offset just past it)
+    """
+    tag = data[offset]
+    offset += 1
+    if tag == _NONE:
+        return None, offset
+    if tag == _INT:
+        return _read_varint(data, offset)
+    if tag == _NEG_INT:
+        number, offset = _read_varint(data, offset)
+        return -number, offset
+    if tag == _FLOAT:
+        return _DOUBLE.unpack_from(data, offset)[0], offset + _DOUBLE.size
+
+    length, offset = _read_varint(data, offset)
+    payload = data[offset:offset + length]
+    offset += length
+    if tag == _STR:
+        return payload.decode('utf-8'), offset
+    if tag == _BYTES:
+        return payload, offset
+    return pickle.loads(payload), offset
+
+
+def function_name(function) -> str:
+    """
+    -Returns the name a dump stores for a hash function: 'module:name'.
+
+    Parameters:
+        function: hash function
+
+    Returns:
+        str: identity of function
+    """
+    return function.__module__ + ':' + function.__name__
+
+
+def resolve_function(name: str):
+    """
+    -Imports the hash function a dump was written with.
+
+    Parameters:
+        name(str): identity written by function_name()
+
+    Returns:
+        function: the hash function
+    """
+    module, _, attribute = name.partition(':')
+    return getattr(importlib.import_module(module), attribute)
+
+
+class DumpWriter:
+    """
+    Streams a HashMap dump to a file: header first, then one record per bucket entry, then the end marker.
+    Use as a context manager; the end marker is written when it closes without an exception.
+    """
+    def __init__(self, path: str, kind: bytes, capacity: int, function) -> None:
+        self._file = open(path, 'wb', buffering=_BUFFER_SIZE)
+        name = function_name(function).encode('utf-8')
+        self._file.write(_MAGIC + kind + _varint(capacity) + _varint(len(name)) + name)
+
+    def __enter__(self) -> "DumpWriter":
+        return self
+
+    def __exit__(self, exc_type, *exc_info) -> None:
+        if exc_type is None:
+            self._file.write(bytes((_END,)))
+        self._file.close()
+
+    def entry(self, index: int, hash_val: int, key: object, value: object, ttl: float = None) -> None:
+        """
+        -Writes one live entry.
+            - ttl is stored as time left rather than a clock() reading, so it means the same to whichever
+                process or clock loads the dump
+
+        Parameters:
+            index(int): bucket index of the entry
+            hash_val(int): cached hash of key
+            key(object): the identifier
+            value(object): the identifier's value
+            ttl(float): seconds until the entry expires --> None for no expiry
+
+        Returns:
+            None
+        """
+        if _WIDE_HASH <= hash_val <= 0xFFFFFFFFFFFFFFFF:
+            head = bytes((_WIDE_ENTRY,)) + _varint(index) + _WORD.pack(hash_val)
+        else:
+            head = bytes((_ENTRY,)) + _varint(index) + _varint(hash_val)
+        if ttl is not None:
+            head = bytes((_TTL,)) + _DOUBLE.pack(ttl) + head
+        self._file.write(head + encode_object(key) + encode_object(value))
+
+    def tombstone(self, index: int) -> None:
+        """
+        -Writes one open addressing tombstone, so probe sequences running through it survive the reload.
+
+        Parameters:
+            index(int): bucket index of the tombstone
+
+        Returns:
+            None
+        """
+        self._file.write(bytes((_TOMBSTONE,)) + _varint(index))
+
+
+def read_dump(path: str, kind: bytes, function=None) -> tuple:
+    """
+    -Reads a dump written by DumpWriter.
+        - function, if given, must be the one the dump was written with; otherwise the stored name is imported
+        - the first entry's hash is recomputed, so a function that hashes differently in this process
+            (hash_siphash, or hash_builtin on str keys) is caught instead of silently losing keys
+
+    Parameters:
+        path(str): dump file
+        kind(bytes): expected map kind, b'S' or b'O'
+        function: hash function of the dumped map, or None to look it up by name
+
+    Returns:
+        tuple: (capacity, function, records) where records yields (index, hash, key, value, ttl) in file order
+            --> hash is None for tombstones, ttl is None for entries that never expire
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+
+    if data[:len(_MAGIC)] != _MAGIC or data[len(_MAGIC):len(_MAGIC) + 1] != kind:
+        raise ValueError(path + " is not a dump of this kind of HashMap")
+    offset = len(_MAGIC) + 1
+    capacity, offset = _read_varint(data, offset)
+    length, offset = _read_varint(data, offset)
+    name = data[offset:offset + length].decode('utf-8')
+    offset += length
+
+    if function is None:
+        function = resolve_function(name)
+    elif function_name(function) != name:
+        raise ValueError("dump was written with hash function " + name)
+
+    return capacity, function, _records(data, offset, function, name)
+
+
+def _records(data: bytes, offset: int, function, name: str):
+    """
+    -Generator over the records of a dump, starting at offset (just past the header).
+
+    Parameters:
+        data(bytes): dump contents
+        offset(int): position of the first record
+        function: hash function of the dumped map
+        name(str): stored name of function, for error messages
+
+    Yields:
+        tuple: (index, hash, key, value, ttl) --> hash is None for tombstones, ttl None when there is no expiry
+    """
+    checked = False
+    while True:
+        if offset >= len(data):
+            raise ValueError("dump is truncated")
+        tag = data[offset]
+        if tag == _END:
+            return
+        ttl = None
+        if tag == _TTL:
+            ttl = _DOUBLE.unpack_from(data, offset + 1)[0]
+            offset += 1 + _DOUBLE.size
+            if offset >= len(data):
+                raise ValueError("dump is truncated")
+            tag = data[offset]
+            if tag != _ENTRY and tag != _WIDE_ENTRY:
+                raise ValueError("dump is corrupt")
+        index, offset = _read_varint(data, offset + 1)
+        if tag == _ENTRY or tag == _WIDE_ENTRY:
+            if tag == _ENTRY:
+                hash_val, offset = _read_varint(data, offset)
+            else:
+                hash_val = _WORD.unpack_from(data, offset)[0]
+                offset += _WORD.size
+            key, offset = decode_object(data, offset)
+            value, offset = decode_object(data, offset)
+            if not checked:
+                if function(key) != hash_val:
+                    raise ValueError("hash function " + name + " does not reproduce the dumped hashes")
+                checked = True
+            yield index, hash_val, key, value, ttl
+        elif tag == _TOMBSTONE:
+            yield index, None, None, None, None
+        else:
+            raise ValueError("dump is corrupt")